@@ -1,13 +1,17 @@
 import os
-import json
+import hashlib
 import logging
-import uuid
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, date
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any
+from cachetools import TTLCache
 from together import Together
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from supabase import Client
+from supabase_client import get_supabase
 
 # Load environment variables
 load_dotenv()
@@ -22,6 +26,191 @@ class RestaurantAI:
     Uses Together AI for natural language processing with fallback between API and Supabase database.
     """
     
+    # System message shared by every conversation; built once at import
+    SYSTEM_PROMPT = {
+        "role": "system",
+        "content": """You are FoodieSpot AI, a restaurant reservation assistant. You can:
+            1. Search for restaurants based on cuisine, location, price range, and ratings
+            2. Check availability for specific dates and times
+            3. Make reservations for customers
+            4. Provide smart recommendations based on user preferences
+            
+            CRITICAL: When a user wants to make a reservation, you MUST use the create_reservation tool.
+            Do NOT just respond conversationally about reservations.
+
+            If a user provides reservation details, immediately call the create_reservation tool with the provided information.
+
+            Required fields for reservations:
+            - restaurant_name (name of the restaurant)
+            - customer_name
+            - customer_email  
+            - party_size
+            - reservation_date (YYYY-MM-DD format)
+            - reservation_time (HH:MM format)
+            - special_requests (optional)
+            
+            If any required information is missing, ask for it before proceeding.
+            Always be polite, helpful, and ask for clarification when needed."""
+    }
+    
+    # Restaurant columns needed for search results and recommendations
+    _RESTAURANT_COLUMNS = 'id,name,cuisine,city,rating,price_range,capacity'
+    
+    # Tool results starting with these are shown as-is, without a second LLM call
+    _SKIP_FINALIZE_PREFIXES = ('🎉', '✅', '❌', '•', 'Found')
+    
+    # Date formats accepted by _validate_and_fix_date, tried in order
+    _DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%m/%d/%Y", "%d-%m-%Y")
+    
+    # Function-calling schema sent with every chat completion; built once at import
+    TOOLS = [
+        {
+            "type": "function",
+            "function": {
+                "name": "search_restaurants",
+                "description": "Search for restaurants based on various criteria",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "cuisine": {
+                            "type": "string",
+                            "description": "Type of cuisine (e.g., Italian, Chinese, Mexican)"
+                        },
+                        "location": {
+                            "type": "string",
+                            "description": "Location or area to search in"
+                        },
+                        "price_range": {
+                            "type": "string",
+                            "enum": ["$", "$", "$$", "$$"],
+                            "description": "Price range from $ (budget) to $$ (luxury)"
+                        },
+                        "min_rating": {
+                            "type": "number",
+                            "minimum": 1,
+                            "maximum": 5,
+                            "description": "Minimum rating (1-5 stars)"
+                        }
+                    }
+                }
+            }
+        },
+        {
+            "type": "function",
+            "function": {
+                "name": "check_availability",
+                "description": "Check if a restaurant has availability for a specific date and time",
+                "parameters": {
+                    "type": "object",
+                    "required": ["restaurant_name", "date", "time", "party_size"],
+                    "properties": {
+                        "restaurant_name": {
+                            "type": "string",
+                            "description": "Name of the restaurant"
+                        },
+                        "date": {
+                            "type": "string",
+                            "description": "Reservation date in YYYY-MM-DD format"
+                        },
+                        "time": {
+                            "type": "string",
+                            "description": "Reservation time in HH:MM format (24-hour)"
+                        },
+                        "party_size": {
+                            "type": "integer",
+                            "minimum": 1,
+                            "description": "Number of people in the party"
+                        }
+                    }
+                }
+            }
+        },
+        {
+            "type": "function",
+            "function": {
+                "name": "create_reservation",
+                "description": "Create a new restaurant reservation",
+                "parameters": {
+                    "type": "object",
+                    "required": ["restaurant_name", "customer_name", "customer_email", "party_size", "reservation_date", "reservation_time"],
+                    "properties": {
+                        "restaurant_name": {
+                            "type": "string",
+                            "description": "Name of the restaurant"
+                        },
+                        "customer_name": {
+                            "type": "string",
+                            "description": "Full name of the customer making the reservation"
+                        },
+                        "customer_email": {
+                            "type": "string",
+                            "format": "email",
+                            "description": "Email address of the customer"
+                        },
+                        "party_size": {
+                            "type": "integer",
+                            "minimum": 1,
+                            "description": "Number of people in the party"
+                        },
+                        "reservation_date": {
+                            "type": "string",
+                            "description": "Reservation date in YYYY-MM-DD format"
+                        },
+                        "reservation_time": {
+                            "type": "string",
+                            "description": "Reservation time in HH:MM format (24-hour)"
+                        },
+                        "special_requests": {
+                            "type": "string",
+                            "description": "Any special requests or dietary requirements"
+                        }
+                    }
+                }
+            }
+        },
+        {
+            "type": "function",
+            "function": {
+                "name": "get_recommendations",
+                "description": "Get smart restaurant recommendations based on user preferences",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "cuisine": {
+                            "type": "string",
+                            "description": "Preferred cuisine type"
+                        },
+                        "city": {
+                            "type": "string", 
+                            "description": "Preferred location/city"
+                        },
+                        "budget": {
+                            "type": "string",
+                            "enum": ["budget", "moderate", "upscale", "luxury"],
+                            "description": "Budget preference"
+                        },
+                        "price_range": {
+                            "type": "string",
+                            "enum": ["$", "$", "$$", "$$"],
+                            "description": "Price range preference"
+                        },
+                        "min_rating": {
+                            "type": "number",
+                            "minimum": 1,
+                            "maximum": 5,
+                            "description": "Minimum rating requirement"
+                        },
+                        "party_size": {
+                            "type": "integer",
+                            "minimum": 1,
+                            "description": "Number of people"
+                        }
+                    }
+                }
+            }
+        }
+    ]
+    
     def __init__(self, api_base_url: Optional[str] = None, use_api_first: bool = True):
         """
         Initialize the Restaurant AI agent with dual mode support.
@@ -44,6 +233,9 @@ class RestaurantAI:
         
         self.client = Together(api_key=api_key)
         self.context: List[Dict[str, Any]] = []
+        
+        # Tool-free answers keyed by the conversation that produced them
+        self._llm_cache = TTLCache(maxsize=256, ttl=300)
         self.last_search_results: List[Dict[str, Any]] = []
         
         # API configuration
@@ -51,49 +243,37 @@ class RestaurantAI:
         self.use_api_first = use_api_first
         self.api_available = None  # Cache API availability status
         
+        # Keep-alive session shared by every API call
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50,
+                              max_retries=Retry(total=2, backoff_factor=0.1))
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        
         # Supabase configuration for fallback
-        self.supabase: Client = create_client(supabase_url, supabase_anon_key)
+        self.supabase: Client = get_supabase()
         self.db_initialized = False
         
         # Test connections on startup
         self._test_connections()
         
         # System prompt for better AI behavior
-        self.system_prompt = {
-            "role": "system",
-            "content": """You are FoodieSpot AI, a restaurant reservation assistant. You can:
-            1. Search for restaurants based on cuisine, location, price range, and ratings
-            2. Check availability for specific dates and times
-            3. Make reservations for customers
-            4. Provide smart recommendations based on user preferences
-            
-            CRITICAL: When a user wants to make a reservation, you MUST use the create_reservation tool.
-            Do NOT just respond conversationally about reservations.
-
-            If a user provides reservation details, immediately call the create_reservation tool with the provided information.
-
-            Required fields for reservations:
-            - restaurant_name (name of the restaurant)
-            - customer_name
-            - customer_email  
-            - party_size
-            - reservation_date (YYYY-MM-DD format)
-            - reservation_time (HH:MM format)
-            - special_requests (optional)
-            
-            If any required information is missing, ask for it before proceeding.
-            Always be polite, helpful, and ask for clarification when needed."""
-        }
+        self.system_prompt = self.SYSTEM_PROMPT
         self.context.append(self.system_prompt)
         
-        # Define available tools
-        self.tools = self._initialize_tools()
+        # Tool name -> handler lookup used by _process_tool
+        self._tool_dispatch = {
+            "search_restaurants": self._process_tool_search_restaurants,
+            "check_availability": self._process_tool_check_availability,
+            "create_reservation": self._process_tool_create_reservation,
+            "get_recommendations": self._process_tool_get_recommendations
+        }
     
     def _test_connections(self):
         """Test both API and Supabase connections on startup."""
         # Test API connection
         try:
-            response = requests.get(f"{self.api_base}/restaurants", timeout=5)
+            response = self._session.get(f"{self.api_base}/restaurants", timeout=5)
             if response.status_code == 200:
                 self.api_available = True
                 logger.info("✅ API connection successful")
@@ -291,17 +471,17 @@ class RestaurantAI:
                         query_params = "&".join([f"{k}={v}" for k, v in params.items() if v is not None])
                         if query_params:
                             url += f"?{query_params}"
-                    response = requests.get(url, timeout=10)
+                    response = self._session.get(url, timeout=10)
                 else:
-                    response = requests.post(
+                    response = self._session.post(
                         url, 
-                        json=params, 
+                        data=orjson.dumps(params), 
                         timeout=10,
                         headers={'Content-Type': 'application/json'}
                     )
                 
                 if response.status_code in [200, 201]:
-                    return response.json()
+                    return orjson.loads(response.content)
                 else:
                     logger.warning(f"API Error: {response.status_code}, falling back to Supabase")
                     
@@ -336,7 +516,7 @@ class RestaurantAI:
     def _supabase_search_restaurants(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Search restaurants in Supabase."""
         try:
-            query = self.supabase.table('restaurants').select('*')
+            query = self.supabase.table('restaurants').select(self._RESTAURANT_COLUMNS)
             
             if params.get('cuisine'):
                 query = query.ilike('cuisine', f"%{params['cuisine']}%")
@@ -403,25 +583,31 @@ class RestaurantAI:
             time = params.get('time', '')
             
             # Get restaurant
-            restaurant_result = self.supabase.table('restaurants').select('*').ilike('name', restaurant_name).limit(1).execute()
+            restaurant_result = self.supabase.table('restaurants').select('id,name').ilike('name', restaurant_name).limit(1).execute()
             
             if not restaurant_result.data:
                 return {"success": False, "error": "Restaurant not found", "source": "supabase"}
             
             restaurant = restaurant_result.data[0]
             
-            # Check existing reservations for the same date and time
-            reservations_result = self.supabase.table('reservations').select('party_size').eq('restaurant_id', restaurant['id']).eq('date', date).eq('time', time).execute()
+            # Capacity and seats already booked for the slot, summed in Postgres
+            slot_result = self.supabase.rpc('check_availability', {
+                'rid': restaurant['id'],
+                'rdate': date,
+                'rtime': time
+            }).execute()
+            
+            if not slot_result.data:
+                return {"success": False, "error": "Restaurant not found", "source": "supabase"}
             
-            capacity = restaurant.get('capacity', 50)
-            current_bookings = sum(r['party_size'] for r in reservations_result.data)
-            available_seats = capacity - current_bookings
+            slot = slot_result.data[0]
+            available_seats = (slot['capacity'] or 50) - slot['reserved']
             
             return {
                 "success": True,
                 "available": available_seats > 0,
                 "available_seats": max(0, available_seats),
-                "restaurant_name": restaurant['name'],
+                "restaurant_name": slot['name'],
                 "source": "supabase"
             }
             
@@ -432,7 +618,7 @@ class RestaurantAI:
     def _supabase_get_recommendations(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Get recommendations from Supabase."""
         try:
-            query = self.supabase.table('restaurants').select('*')
+            query = self.supabase.table('restaurants').select(self._RESTAURANT_COLUMNS)
             
             if params.get('cuisine'):
                 query = query.ilike('cuisine', f"%{params['cuisine']}%")
@@ -472,182 +658,36 @@ class RestaurantAI:
     
     def _validate_and_fix_date(self, date_str: str) -> str:
         """Validate and fix date format, handling 2024/2025 issue."""
-        try:
-            # Parse the input date
-            parsed_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-            
-            # Get current date
-            current_date = date.today()
-            
-            # If the parsed date is in the past (e.g., 2024), update to current year
-            if parsed_date < current_date:
-                # Check if it's a year issue
-                if parsed_date.year < current_date.year:
-                    # Update to current year
-                    fixed_date = parsed_date.replace(year=current_date.year)
-                    logger.info(f"Date corrected from {date_str} to {fixed_date.isoformat()}")
-                    return fixed_date.isoformat()
-                else:
-                    # Date is in the past but same year - could be valid for same-day reservations
-                    if (current_date - parsed_date).days > 1:
-                        logger.warning(f"Date {date_str} is more than 1 day in the past")
-            
+        # Parse the input date using the first format that matches
+        parsed_date = None
+        for date_format in self._DATE_FORMATS:
+            try:
+                parsed_date = datetime.strptime(date_str, date_format).date()
+                break
+            except ValueError:
+                continue
+        
+        if parsed_date is None:
+            logger.error(f"Invalid date format: {date_str}, keeping original value")
             return date_str
-            
-        except ValueError as e:
-            logger.error(f"Invalid date format: {date_str}, error: {e}")
-            # Return current date as fallback
-            return date.today().isoformat()
-    
-    def _initialize_tools(self) -> List[Dict[str, Any]]:
-        """Initialize the available tools for the AI agent."""
-        return [
-            {
-                "type": "function",
-                "function": {
-                    "name": "search_restaurants",
-                    "description": "Search for restaurants based on various criteria",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "cuisine": {
-                                "type": "string",
-                                "description": "Type of cuisine (e.g., Italian, Chinese, Mexican)"
-                            },
-                            "location": {
-                                "type": "string",
-                                "description": "Location or area to search in"
-                            },
-                            "price_range": {
-                                "type": "string",
-                                "enum": ["$", "$", "$$", "$$"],
-                                "description": "Price range from $ (budget) to $$ (luxury)"
-                            },
-                            "min_rating": {
-                                "type": "number",
-                                "minimum": 1,
-                                "maximum": 5,
-                                "description": "Minimum rating (1-5 stars)"
-                            }
-                        }
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "check_availability",
-                    "description": "Check if a restaurant has availability for a specific date and time",
-                    "parameters": {
-                        "type": "object",
-                        "required": ["restaurant_name", "date", "time", "party_size"],
-                        "properties": {
-                            "restaurant_name": {
-                                "type": "string",
-                                "description": "Name of the restaurant"
-                            },
-                            "date": {
-                                "type": "string",
-                                "description": "Reservation date in YYYY-MM-DD format"
-                            },
-                            "time": {
-                                "type": "string",
-                                "description": "Reservation time in HH:MM format (24-hour)"
-                            },
-                            "party_size": {
-                                "type": "integer",
-                                "minimum": 1,
-                                "description": "Number of people in the party"
-                            }
-                        }
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "create_reservation",
-                    "description": "Create a new restaurant reservation",
-                    "parameters": {
-                        "type": "object",
-                        "required": ["restaurant_name", "customer_name", "customer_email", "party_size", "reservation_date", "reservation_time"],
-                        "properties": {
-                            "restaurant_name": {
-                                "type": "string",
-                                "description": "Name of the restaurant"
-                            },
-                            "customer_name": {
-                                "type": "string",
-                                "description": "Full name of the customer making the reservation"
-                            },
-                            "customer_email": {
-                                "type": "string",
-                                "format": "email",
-                                "description": "Email address of the customer"
-                            },
-                            "party_size": {
-                                "type": "integer",
-                                "minimum": 1,
-                                "description": "Number of people in the party"
-                            },
-                            "reservation_date": {
-                                "type": "string",
-                                "description": "Reservation date in YYYY-MM-DD format"
-                            },
-                            "reservation_time": {
-                                "type": "string",
-                                "description": "Reservation time in HH:MM format (24-hour)"
-                            },
-                            "special_requests": {
-                                "type": "string",
-                                "description": "Any special requests or dietary requirements"
-                            }
-                        }
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_recommendations",
-                    "description": "Get smart restaurant recommendations based on user preferences",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "cuisine": {
-                                "type": "string",
-                                "description": "Preferred cuisine type"
-                            },
-                            "city": {
-                                "type": "string", 
-                                "description": "Preferred location/city"
-                            },
-                            "budget": {
-                                "type": "string",
-                                "enum": ["budget", "moderate", "upscale", "luxury"],
-                                "description": "Budget preference"
-                            },
-                            "price_range": {
-                                "type": "string",
-                                "enum": ["$", "$", "$$", "$$"],
-                                "description": "Price range preference"
-                            },
-                            "min_rating": {
-                                "type": "number",
-                                "minimum": 1,
-                                "maximum": 5,
-                                "description": "Minimum rating requirement"
-                            },
-                            "party_size": {
-                                "type": "integer",
-                                "minimum": 1,
-                                "description": "Number of people"
-                            }
-                        }
-                    }
-                }
-            }
-        ]
+        
+        # Get current date
+        current_date = date.today()
+        
+        # If the parsed date is in the past (e.g., 2024), update to current year
+        if parsed_date < current_date:
+            # Check if it's a year issue
+            if parsed_date.year < current_date.year:
+                # Update to current year
+                fixed_date = parsed_date.replace(year=current_date.year)
+                logger.info(f"Date corrected from {date_str} to {fixed_date.isoformat()}")
+                return fixed_date.isoformat()
+            else:
+                # Date is in the past but same year - could be valid for same-day reservations
+                if (current_date - parsed_date).days > 1:
+                    logger.warning(f"Date {date_str} is more than 1 day in the past")
+        
+        return parsed_date.isoformat()
     
     def _process_tool_search_restaurants(self, parameters: Dict[str, Any]) -> str:
         """Process restaurant search tool call."""
@@ -787,105 +827,176 @@ class RestaurantAI:
         """Execute tool calls with proper error handling and logging."""
         logger.info(f"Processing tool: {tool_name}")
         
+        handler = self._tool_dispatch.get(tool_name)
+        if handler is None:
+            return f"Unknown tool: {tool_name}"
+        
         try:
-            if tool_name == "search_restaurants":
-                return self._process_tool_search_restaurants(parameters)
-            elif tool_name == "check_availability":
-                return self._process_tool_check_availability(parameters)
-            elif tool_name == "create_reservation":
-                return self._process_tool_create_reservation(parameters)
-            elif tool_name == "get_recommendations":
-                return self._process_tool_get_recommendations(parameters)
-            else:
-                return f"Unknown tool: {tool_name}"
-                
+            return handler(parameters)
         except Exception as e:
             logger.error(f"Error processing tool {tool_name}: {str(e)}")
             return f"Error executing {tool_name}. Please try again."
     
     def chat(self, user_input: str) -> str:
         """Process user input and generate AI response with tool calls."""
+        return "".join(self.stream_chat(user_input))
+    
+    def stream_chat(self, user_input: str) -> Iterator[str]:
+        """
+        Process user input and yield the AI response as it is generated.
+        
+        Tool-call turns are accumulated from the stream, executed, and the
+        final answer is streamed back in the same way.
+        """
         if not user_input.strip():
-            return "Please provide a message. How can I help you with restaurants today?"
+            yield "Please provide a message. How can I help you with restaurants today?"
+            return
         
-        user_message = {"role": "user", "content": user_input.strip()}
+        # Collapse whitespace so repeated utterances share an answer cache entry
+        user_message = {"role": "user", "content": " ".join(user_input.split())}
         self.context.append(user_message)
         
         # Keep context manageable
         if len(self.context) > 15:
             self.context = [self.system_prompt] + self.context[-14:]
         
+        # Same conversation so far (e.g. a rerun or a suggestion button) -> reuse the answer
+        cache_key = hashlib.blake2b(orjson.dumps(self.context), digest_size=16).hexdigest()
+        cached = self._llm_cache.get(cache_key)
+        if cached is not None:
+            self.context.append({"role": "assistant", "content": cached})
+            yield cached
+            return
+        
         try:
-            response = self.client.chat.completions.create(
+            stream = self.client.chat.completions.create(
                 model="meta-llama/Meta-Llama-3.1-8B-Instruct-Turbo",
                 messages=self.context,
-                tools=self.tools,
+                tools=self.TOOLS,
                 temperature=0.7,
-                max_tokens=800
+                max_tokens=800,
+                stream=True
             )
             
-            msg = response.choices[0].message
+            content_parts = []
+            tool_calls: Dict[int, Dict[str, Any]] = {}
+            
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+                if delta is None:
+                    continue
+                
+                if delta.content:
+                    content_parts.append(delta.content)
+                    yield delta.content
+                
+                # Tool calls arrive as fragments keyed by their index
+                for position, tool_call in enumerate(getattr(delta, 'tool_calls', None) or []):
+                    index = getattr(tool_call, 'index', None)
+                    if index is None:
+                        index = position
+                    entry = tool_calls.setdefault(index, {
+                        "id": None,
+                        "type": "function",
+                        "function": {"name": "", "arguments": ""}
+                    })
+                    if tool_call.id:
+                        entry["id"] = tool_call.id
+                    if tool_call.function:
+                        if tool_call.function.name:
+                            entry["function"]["name"] += tool_call.function.name
+                        if tool_call.function.arguments:
+                            entry["function"]["arguments"] += tool_call.function.arguments
             
+            content = "".join(content_parts)
             assistant_message = {
                 "role": "assistant", 
-                "content": msg.content or "",
-                "tool_calls": getattr(msg, 'tool_calls', None)
+                "content": content,
+                "tool_calls": [tool_calls[i] for i in sorted(tool_calls)] or None
             }
             self.context.append(assistant_message)
             
+            # Tool calls have side effects (bookings), so only plain answers are cached
+            if not tool_calls and content:
+                self._llm_cache[cache_key] = content
+            
             # Process tool calls if any
-            if hasattr(msg, 'tool_calls') and msg.tool_calls:
-                for tool_call in msg.tool_calls:
+            if tool_calls:
+                tool_results = []
+                for tool_call in assistant_message["tool_calls"]:
                     try:
-                        parameters = json.loads(tool_call.function.arguments)
-                        result = self._process_tool(tool_call.function.name, parameters)
+                        parameters = orjson.loads(tool_call["function"]["arguments"] or "{}")
+                        result = self._process_tool(tool_call["function"]["name"], parameters)
+                        tool_results.append(result)
                         
                         tool_message = {
                             "role": "tool",
                             "content": result,
-                            "tool_call_id": tool_call.id
+                            "tool_call_id": tool_call["id"]
                         }
                         self.context.append(tool_message)
                         
-                    except json.JSONDecodeError as e:
+                    except orjson.JSONDecodeError as e:
                         logger.error(f"JSON parsing error: {e}")
                         error_result = "Error parsing tool parameters"
+                        tool_results.append(error_result)
                         tool_message = {
                             "role": "tool",
                             "content": error_result,
-                            "tool_call_id": tool_call.id
+                            "tool_call_id": tool_call["id"]
                         }
                         self.context.append(tool_message)
                 
+                # A single self-explanatory tool result is already the answer
+                if len(tool_results) == 1 and tool_results[0].startswith(self._SKIP_FINALIZE_PREFIXES):
+                    self.context.append({
+                        "role": "assistant",
+                        "content": tool_results[0]
+                    })
+                    yield tool_results[0]
+                    return
+                
                 # Get final response
                 try:
-                    final_response = self.client.chat.completions.create(
+                    final_stream = self.client.chat.completions.create(
                         model="meta-llama/Meta-Llama-3.1-8B-Instruct-Turbo",
                         messages=self.context,
                         temperature=0.7,
-                        max_tokens=600
+                        max_tokens=600,
+                        stream=True
                     )
                     
-                    final_content = final_response.choices[0].message.content or "I've processed your request."
+                    final_parts = []
+                    for chunk in final_stream:
+                        if chunk.choices and chunk.choices[0].delta and chunk.choices[0].delta.content:
+                            final_parts.append(chunk.choices[0].delta.content)
+                            yield chunk.choices[0].delta.content
+                    
+                    final_content = "".join(final_parts)
+                    if not final_content:
+                        final_content = "I've processed your request."
+                        yield final_content
                     
                     self.context.append({
                         "role": "assistant",
                         "content": final_content
                     })
                     
-                    return final_content
-                    
                 except Exception as e:
                     logger.error(f"Error getting final response: {e}")
-                    return "I've completed your request, but had trouble generating a final response."
+                    yield "I've completed your request, but had trouble generating a final response."
+                return
             
-            return msg.content or "I'm here to help with restaurants. What would you like to know?"
+            if not content:
+                yield "I'm here to help with restaurants. What would you like to know?"
             
         except Exception as e:
             logger.error(f"Chat processing error: {str(e)}")
             error_msg = "I'm having trouble processing your request right now. Please try again in a moment."
             self.context.append({"role": "assistant", "content": error_msg})
-            return error_msg
+            yield error_msg
     
     def reset_conversation(self):
         """Reset the conversation context."""
@@ -930,4 +1041,7 @@ try:
         logger.info(f"Database contains {status['database_stats']['restaurants']} restaurants and {status['database_stats']['reservations']} reservations")
 except Exception as e:
     logger.error(f"Failed to initialize Restaurant AI agent: {e}")
-    ai_agent = None
\ No newline at end of file
+    ai_agent = None
+
+# Export for use in other modules
+__all__ = ['ai_agent', 'RestaurantAI']
@@ -1,10 +1,22 @@
+import hashlib
 import logging
-from flask import Flask, jsonify, request, render_template_string
+import orjson
+from functools import wraps
+from flask import Flask, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-from supabase import create_client
-from pydantic import BaseModel, field_validator, ValidationError, EmailStr
-from datetime import datetime, date
+from flask_caching import Cache
+from flask_compress import Compress
+from postgrest.exceptions import APIError
+from supabase_client import get_supabase
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field, field_validator, ValidationError
+from datetime import date
 import os
+import re
+import threading
+from cachetools import TTLCache
+from concurrent.futures import Future
+from typing import Annotated, Dict, List
 from dotenv import load_dotenv
 from recommendation_engine import recommendation_engine
 
@@ -17,7 +29,25 @@ logger = logging.getLogger(__name__)
 
 load_dotenv()
 
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that encodes and decodes with orjson."""
+
+    def encode(self, obj) -> bytes:
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS)
+
+    def dumps(self, obj, **kwargs):
+        return self.encode(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response instead of round-tripping through str
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.encode(obj), mimetype=self.mimetype)
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 # Enhanced CORS configuration for Render deployment
 CORS(app, origins=[
@@ -28,17 +58,84 @@ CORS(app, origins=[
     "http://127.0.0.1:5000"
 ], supports_credentials=True)
 
+# Gzip/Brotli-compress JSON responses for clients that accept it (adds Vary: Accept-Encoding)
+Compress(app)
+
+# How long catalog responses and recommendations are reused before hitting Supabase again
+CATALOG_CACHE_TIMEOUT = 300
+
+# Response cache for catalog endpoints; Redis when configured, in-process otherwise
+cache = Cache(app, config={
+    'CACHE_TYPE': 'RedisCache' if os.getenv('REDIS_URL') else 'SimpleCache',
+    'CACHE_REDIS_URL': os.getenv('REDIS_URL'),
+    'CACHE_DEFAULT_TIMEOUT': CATALOG_CACHE_TIMEOUT
+})
+
+# Bumped when the restaurants table changes; part of every /api/restaurants cache key
+RESTAURANTS_GENERATION_KEY = 'restaurants/generation'
+
+def restaurants_cache_key(*args, **kwargs):
+    """Cache key for /api/restaurants: current generation plus a hash of the query string."""
+    generation = cache.get(RESTAURANTS_GENERATION_KEY) or 0
+    query = str(sorted(request.args.items(multi=True))).encode()
+    return f"restaurants/{generation}/{hashlib.blake2b(query, digest_size=16).hexdigest()}"
+
+def is_cacheable_response(response):
+    """Only cache plain successful responses; error paths return (body, status) tuples."""
+    return not isinstance(response, tuple)
+
+def with_etag(view):
+    """Tag successful responses with a content hash; applied under @cache.cached so the tag is cached too."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        response = view(*args, **kwargs)
+        if not isinstance(response, tuple):
+            response.set_etag(hashlib.blake2b(response.get_data(), digest_size=16).hexdigest())
+        return response
+    return wrapper
+
+@app.after_request
+def answer_conditional_get(response):
+    """Turn tagged GET responses into 304 Not Modified when the client's If-None-Match matches."""
+    if request.method == 'GET' and 'ETag' in response.headers:
+        response.make_conditional(request)
+    return response
+
 # Initialize Supabase client
 try:
-    supabase = create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_ANON_KEY"))
+    supabase = get_supabase()
     logger.info("Supabase client initialized successfully")
 except Exception as e:
     logger.error(f"Failed to initialize Supabase client: {str(e)}")
     raise
 
+# Restaurant columns returned by list endpoints
+RESTAURANT_COLUMNS = 'id,name,cuisine,city,rating,price_range,capacity'
+
+# /api/restaurants query parameters: (name, parser, how it narrows the query)
+RESTAURANT_FILTERS = (
+    ('cuisine', str, lambda query, value: query.ilike('cuisine', f"%{value}%")),
+    ('city', str, lambda query, value: query.ilike('city', f"%{value}%")),
+    ('price_range', str, lambda query, value: query.eq('price_range', value)),
+    ('search', str, lambda query, value: query.text_search(
+        'searchable', value, options={'config': 'simple', 'type': 'websearch'})),
+    ('min_rating', float, lambda query, value: query.gte('rating', value)),
+)
+
+# Lightweight email shape check; deliverability is not verified
+_EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+def validate_email(value: str) -> str:
+    if not _EMAIL_RE.match(value):
+        raise ValueError("value is not a valid email address")
+    return value
+
+Email = Annotated[str, AfterValidator(validate_email)]
+
 # Pydantic models for validation
-class AvailabilityRequest(BaseModel):
-    restaurant_id: str
+class SlotRequest(BaseModel):
+    model_config = ConfigDict(extra='ignore')
+
     date: date
     time: str
     party_size: int
@@ -57,17 +154,152 @@ class AvailabilityRequest(BaseModel):
             raise ValueError("Party size must be between 1 and 20")
         return value
 
+class AvailabilityRequest(SlotRequest):
+    restaurant_id: str
+
+class AvailabilityBatchRequest(SlotRequest):
+    restaurant_ids: Annotated[List[str], Field(min_length=1, max_length=100)]
+
 class ReservationRequest(AvailabilityRequest):
-    user_email: EmailStr
+    user_email: Email
     user_name: str
 
-# ROOT ROUTE - FIXES 404 ERROR
-@app.route('/')
-def home():
-    """Root route to fix 404 deployment error"""
-    # Try to serve HTML template first
+def validation_details(error: ValidationError):
+    """Flatten pydantic errors to field/message pairs; malformed JSON has no field."""
+    return [{'field': str(err['loc'][0]) if err['loc'] else 'body', 'message': err['msg']}
+            for err in error.errors()]
+
+def get_slots_capacity(data: AvailabilityBatchRequest):
+    """Fetch name, capacity and seats reserved for one slot at many restaurants in one query.
+
+    Returns a dict keyed by restaurant id; unknown restaurants are absent.
+    """
+    result = supabase.rpc('check_availability_batch', {
+        'rids': data.restaurant_ids,
+        'rdate': data.date.isoformat(),
+        'rtime': data.time
+    }).execute()
+    return {str(row['id']): row for row in result.data}
+
+# Slot lookups currently running, so identical concurrent probes share one query
+_inflight_slots: Dict[tuple, Future] = {}
+_inflight_lock = threading.Lock()
+
+# Recent slot lookups; bookings go through the database check, so a few seconds of staleness is safe
+_slot_cache = TTLCache(maxsize=4096, ttl=5)
+_MISSING = object()
+
+def slot_key(data: AvailabilityRequest) -> tuple:
+    return (data.restaurant_id, data.date, data.time)
+
+def evict_slot(data: AvailabilityRequest):
+    """Forget this worker's cached view of a slot after a booking attempt changed or probed it."""
+    with _inflight_lock:
+        _slot_cache.pop(slot_key(data), None)
+
+def get_slot_capacity(data: AvailabilityRequest):
+    """Fetch restaurant name, capacity and seats already reserved for a slot in one query.
+
+    Results are reused for a few seconds, and concurrent calls for the same slot
+    wait on the first caller's query instead of issuing their own. Returns None
+    when the restaurant does not exist.
+    """
+    key = slot_key(data)
+    with _inflight_lock:
+        cached = _slot_cache.get(key, _MISSING)
+        if cached is not _MISSING:
+            return cached
+        future = _inflight_slots.get(key)
+        leader = future is None
+        if leader:
+            future = _inflight_slots[key] = Future()
+
+    if not leader:
+        return future.result()
+
     try:
-        html_template = """
+        result = supabase.rpc('check_availability', {
+            'rid': data.restaurant_id,
+            'rdate': data.date.isoformat(),
+            'rtime': data.time
+        }).execute()
+        slot = result.data[0] if result.data else None
+        with _inflight_lock:
+            _slot_cache[key] = slot
+        future.set_result(slot)
+        return slot
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            del _inflight_slots[key]
+
+# Recommendations per preference set; the only in-process layer in front of the recommend RPCs
+_recommendation_cache = TTLCache(maxsize=512, ttl=CATALOG_CACHE_TIMEOUT)
+_recommendation_cache_lock = threading.Lock()
+
+def get_recommendations_cached(preferences, limit=10):
+    """Memoize recommendations per preference set in-process for up to CATALOG_CACHE_TIMEOUT seconds.
+
+    Empty results are not stored, so a lookup that found nothing is retried next time.
+    """
+    key = (tuple(sorted(preferences.items())), limit)
+    try:
+        hash(key)
+    except TypeError:
+        # Unhashable preference values (e.g. lists from POST bodies) skip the memo
+        return recommendation_engine.get_recommendations(preferences, limit=limit)
+    
+    with _recommendation_cache_lock:
+        result = _recommendation_cache.get(key)
+    if result is None:
+        result = recommendation_engine.get_recommendations(preferences, limit=limit)
+        if result['recommendations']:
+            with _recommendation_cache_lock:
+                _recommendation_cache[key] = result
+    return result
+
+def invalidate_restaurants_cache():
+    """Retire cached /api/restaurants responses after a restaurants write.
+
+    Recommendations are left alone: the listener runs in its own process and cannot
+    reach the per-worker memo, so they expire after CATALOG_CACHE_TIMEOUT instead.
+    """
+    logger.info("Restaurant catalog changed; retiring cached restaurant listings")
+    # No expiry, so a generation number is never reused while its entries are still cached
+    generation = (cache.get(RESTAURANTS_GENERATION_KEY) or 0) + 1
+    cache.set(RESTAURANTS_GENERATION_KEY, generation, timeout=0)
+
+def annotate_availability(restaurants, preferences):
+    """Return copies of restaurants flagged with 'available' for the requested slot, plus how many are.
+
+    All restaurants are checked in one batch query; they are returned unchanged when
+    the slot is invalid or the lookup fails.
+    """
+    if not restaurants:
+        return restaurants, 0
+    try:
+        slot = AvailabilityBatchRequest.model_validate({
+            'restaurant_ids': [str(restaurant['id']) for restaurant in restaurants],
+            'date': preferences['date'],
+            'time': preferences['time'],
+            'party_size': preferences.get('party_size', 2)
+        })
+        capacities = get_slots_capacity(slot)
+    except Exception as e:
+        logger.warning("Skipping availability for smart recommendations: %s", e)
+        return restaurants, 0
+
+    annotated = []
+    for restaurant in restaurants:
+        capacity = capacities.get(str(restaurant['id']))
+        available = capacity is not None and capacity['capacity'] - capacity['reserved'] >= slot.party_size
+        annotated.append({**restaurant, 'available': available})
+    return annotated, sum(r['available'] for r in annotated)
+
+# Static landing page, built once at import
+HOME_HTML = """
         <!DOCTYPE html>
         <html lang="en">
         <head>
@@ -97,6 +329,7 @@ def home():
                         <li><strong>GET /api/recommendations</strong> - Get recommendations</li>
                         <li><strong>POST /api/recommendations/smart</strong> - Smart recommendations</li>
                         <li><strong>POST /api/availability</strong> - Check availability</li>
+                        <li><strong>POST /api/availability/batch</strong> - Check availability at several restaurants</li>
                         <li><strong>POST /api/reservations</strong> - Create reservation</li>
                     </ul>
                 </div>
@@ -105,75 +338,50 @@ def home():
         </body>
         </html>
         """
-        return render_template_string(html_template)
-    except Exception:
-        # Fallback to JSON response
-        return jsonify({
-            'success': True,
-            'message': 'FoodieSpot API is running',
-            'version': '1.0.0',
-            'deployment': 'render',
-            'endpoints': {
-                'health': '/api/health',
-                'restaurants': '/api/restaurants',
-                'recommendations': '/api/recommendations',
-                'smart_recommendations': '/api/recommendations/smart',
-                'availability': '/api/availability',
-                'reservations': '/api/reservations'
-            }
-        })
+
+# ROOT ROUTE - FIXES 404 ERROR
+@app.route('/')
+def home():
+    """Root route to fix 404 deployment error"""
+    response = app.response_class(HOME_HTML, mimetype='text/html')
+    response.headers['Cache-Control'] = 'public, max-age=3600'
+    return response
+
+# Fixed health payload; probes don't need a timestamp
+HEALTH_BODY = b'{"success":true,"message":"FoodieSpot API is running","deployment":"render"}'
 
 # Health check endpoint
 @app.route('/api/health', methods=['GET'])
 def health_check():
-    logger.info("Health check endpoint accessed")
-    return jsonify({
-        'success': True,
-        'message': 'FoodieSpot API is running',
-        'timestamp': datetime.now().isoformat(),
-        'deployment': 'render'
-    })
+    logger.debug("Health check endpoint accessed")
+    return app.response_class(HEALTH_BODY, mimetype='application/json')
 
 # Get restaurants with filters
 @app.route('/api/restaurants', methods=['GET'])
+@cache.cached(timeout=CATALOG_CACHE_TIMEOUT, make_cache_key=restaurants_cache_key, response_filter=is_cacheable_response)
+@with_etag
 def get_restaurants():
     logger.info(f"GET /api/restaurants called with args: {request.args}")
     
     try:
-        query = supabase.table('restaurants').select('*')
+        query = supabase.table('restaurants').select(RESTAURANT_COLUMNS)
         filters_applied = {}
         
         # Add filters based on query parameters
-        if 'cuisine' in request.args:
-            cuisine = request.args['cuisine']
-            query = query.ilike('cuisine', f"%{cuisine}%")
-            filters_applied['cuisine'] = cuisine
-            logger.debug(f"Applied cuisine filter: {cuisine}")
-        
-        if 'city' in request.args:
-            city = request.args['city']
-            query = query.ilike('city', f"%{city}%")
-            filters_applied['city'] = city
-            logger.debug(f"Applied city filter: {city}")
-        
-        if 'price_range' in request.args:
-            price_range = request.args['price_range']
-            query = query.eq('price_range', price_range)
-            filters_applied['price_range'] = price_range
-            logger.debug(f"Applied price_range filter: {price_range}")
-        
-        if 'min_rating' in request.args:
+        for arg, parse, apply_filter in RESTAURANT_FILTERS:
+            if arg not in request.args:
+                continue
             try:
-                min_rating = float(request.args['min_rating'])
-                query = query.gte('rating', min_rating)
-                filters_applied['min_rating'] = min_rating
-                logger.debug(f"Applied min_rating filter: {min_rating}")
+                value = parse(request.args[arg])
             except ValueError:
-                logger.warning(f"Invalid min_rating format: {request.args['min_rating']}")
+                logger.warning(f"Invalid {arg} format: {request.args[arg]}")
                 return jsonify({
                     'success': False,
-                    'error': 'Invalid min_rating format'
+                    'error': f'Invalid {arg} format'
                 }), 400
+            query = apply_filter(query, value)
+            filters_applied[arg] = value
+            logger.debug("Applied %s filter: %s", arg, value)
         
         # Execute query with ordering
         result = query.order('rating', desc=True).execute()
@@ -197,6 +405,9 @@ def get_restaurants():
 
 # FIXED: Add recommendations endpoint that AI agent expects
 @app.route('/api/recommendations', methods=['GET', 'POST'])
+@cache.cached(timeout=CATALOG_CACHE_TIMEOUT, query_string=True, response_filter=is_cacheable_response,
+              unless=lambda: request.method != 'GET')
+@with_etag
 def get_recommendations():
     logger.info(f"{request.method} /api/recommendations called")
     
@@ -216,7 +427,7 @@ def get_recommendations():
             preferences = {k: v for k, v in preferences.items() if v is not None}
         
         # Use recommendation engine
-        result = recommendation_engine.get_recommendations(preferences, limit=10)
+        result = get_recommendations_cached(preferences, limit=10)
         
         return jsonify({
             'success': True,
@@ -260,15 +471,35 @@ def get_smart_recommendations():
         # Remove None values
         session_prefs = {k: v for k, v in session_prefs.items() if v is not None}
         
-        # Get recommendations
-        result = recommendation_engine.get_recommendations(session_prefs, limit=10)
+        # A valid slot makes the engine flag which restaurants can seat the party
+        slot = None
+        if 'date' in session_prefs and 'time' in session_prefs:
+            try:
+                slot = SlotRequest.model_validate(session_prefs)
+                session_prefs.update(date=slot.date.isoformat(), party_size=slot.party_size)
+            except ValidationError as e:
+                logger.warning("Ignoring invalid slot in smart recommendations: %s", e.errors())
+                session_prefs.pop('date')
+                session_prefs.pop('time')
+        
+        # Get recommendations; availability changes with every booking, so slot queries skip the memo
+        if slot:
+            result = recommendation_engine.get_recommendations(session_prefs, limit=10)
+        else:
+            result = get_recommendations_cached(session_prefs, limit=10)
+        recommendations = result['recommendations']
+        available_count = result.get('available_count', 0)
+        
+        # Fallback rows come without availability; check them in one batch query
+        if slot and result['fallback_used']:
+            recommendations, available_count = annotate_availability(recommendations, session_prefs)
         
         return jsonify({
             'success': True,
-            'data': result['recommendations'],
+            'data': recommendations,
             'meta': {
                 'fallback_used': result['fallback_used'],
-                'available_count': result.get('available_count', 0),
+                'available_count': available_count,
                 'total_count': result.get('total_count', 0),
                 'response_time': result['response_time'],
                 'message': result['message']
@@ -289,54 +520,42 @@ def check_availability():
     
     try:
         # Validate request data
-        request_data = request.get_json(force=True, silent=True)
-        if not request_data:
+        # Parse and validate the raw body in one pass inside pydantic-core
+        request_body = request.get_data(cache=False)
+        if not request_body.strip():
             logger.warning("Empty request body received")
             return jsonify({
                 'success': False,
                 'error': 'Request body is required'
             }), 400
         
-        logger.debug(f"Availability request data: {request_data}")
+        logger.debug("Availability request body: %s", request_body)
         
         try:
-            data = AvailabilityRequest(**request_data)
+            data = AvailabilityRequest.model_validate_json(request_body)
         except ValidationError as e:
             logger.warning(f"Validation error in availability request: {e.errors()}")
             return jsonify({
                 'success': False,
                 'error': 'Validation failed',
-                'details': [{'field': str(err['loc'][0]), 'message': err['msg']} for err in e.errors()]
+                'details': validation_details(e)
             }), 400
         
-        # Get restaurant capacity
-        logger.debug(f"Checking restaurant capacity for ID: {data.restaurant_id}")
-        restaurant_result = supabase.table('restaurants')\
-                           .select('capacity, name')\
-                           .eq('id', data.restaurant_id)\
-                           .execute()
+        # Get restaurant capacity and existing reservations for the same date and time
+        logger.debug("Checking availability for ID: %s on %s at %s", data.restaurant_id, data.date, data.time)
+        restaurant = get_slot_capacity(data)
         
-        if not restaurant_result.data:
+        if not restaurant:
             logger.warning(f"Restaurant not found: {data.restaurant_id}")
             return jsonify({
                 'success': False,
                 'error': 'Restaurant not found'
             }), 404
         
-        restaurant = restaurant_result.data[0]
-        logger.debug(f"Found restaurant: {restaurant['name']} with capacity: {restaurant['capacity']}")
-        
-        # Get existing reservations for the same date and time
-        logger.debug(f"Checking existing reservations for {data.date} at {data.time}")
-        reservations = supabase.table('reservations')\
-                      .select('party_size')\
-                      .eq('restaurant_id', data.restaurant_id)\
-                      .eq('reservation_date', data.date.isoformat())\
-                      .eq('reservation_time', data.time)\
-                      .execute().data
+        logger.debug("Found restaurant: %s with capacity: %s", restaurant['name'], restaurant['capacity'])
         
         # Calculate availability
-        total_reserved = sum(r['party_size'] for r in reservations)
+        total_reserved = restaurant['reserved']
         available_capacity = restaurant['capacity'] - total_reserved
         is_available = available_capacity >= data.party_size
         
@@ -367,6 +586,63 @@ def check_availability():
             'debug_info': str(e) if app.debug else None
         }), 500
 
+# Check availability for one slot at several restaurants
+@app.route('/api/availability/batch', methods=['POST'])
+def check_availability_batch():
+    logger.info("POST /api/availability/batch called")
+    
+    try:
+        request_body = request.get_data(cache=False)
+        if not request_body.strip():
+            logger.warning("Empty request body received for batch availability")
+            return jsonify({
+                'success': False,
+                'error': 'Request body is required'
+            }), 400
+        
+        try:
+            data = AvailabilityBatchRequest.model_validate_json(request_body)
+        except ValidationError as e:
+            logger.warning(f"Validation error in batch availability request: {e.errors()}")
+            return jsonify({
+                'success': False,
+                'error': 'Validation failed',
+                'details': validation_details(e)
+            }), 400
+        
+        logger.debug("Checking availability for %s restaurants on %s at %s",
+                     len(data.restaurant_ids), data.date, data.time)
+        capacities = get_slots_capacity(data)
+        
+        # Unknown restaurants are left out, as check_availability_batch leaves them out
+        results = []
+        for restaurant_id in data.restaurant_ids:
+            restaurant = capacities.get(restaurant_id)
+            if restaurant is None:
+                continue
+            available_capacity = restaurant['capacity'] - restaurant['reserved']
+            results.append({
+                'restaurant_id': restaurant_id,
+                'restaurant_name': restaurant['name'],
+                'available': available_capacity >= data.party_size,
+                'available_seats': available_capacity
+            })
+        
+        return jsonify({
+            'success': True,
+            'data': results,
+            'available_count': sum(r['available'] for r in results),
+            'requested_party_size': data.party_size
+        })
+    
+    except Exception as e:
+        logger.error(f"Unexpected error in batch availability check: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to check availability',
+            'debug_info': str(e) if app.debug else None
+        }), 500
+
 # Create reservation
 @app.route('/api/reservations', methods=['POST'])
 def create_reservation():
@@ -374,88 +650,74 @@ def create_reservation():
     
     try:
         # Validate request data
-        request_data = request.get_json(force=True, silent=True)
-        if not request_data:
+        # Parse and validate the raw body in one pass inside pydantic-core
+        request_body = request.get_data(cache=False)
+        if not request_body.strip():
             logger.warning("Empty request body received for reservation")
             return jsonify({
                 'success': False,
                 'error': 'Request body is required'
             }), 400
         
-        logger.debug(f"Reservation request data: {request_data}")
+        logger.debug("Reservation request body: %s", request_body)
         
         try:
-            data = ReservationRequest(**request_data)
+            data = ReservationRequest.model_validate_json(request_body)
         except ValidationError as e:
             logger.warning(f"Validation error in reservation request: {e.errors()}")
             return jsonify({
                 'success': False,
                 'error': 'Validation failed',
-                'details': [{'field': str(err['loc'][0]), 'message': err['msg']} for err in e.errors()]
+                'details': validation_details(e)
             }), 400
         
-        # Check restaurant exists and get capacity
-        logger.debug(f"Verifying restaurant exists: {data.restaurant_id}")
-        restaurant_result = supabase.table('restaurants')\
-                           .select('capacity, name')\
-                           .eq('id', data.restaurant_id)\
-                           .execute()
+        # Insert in one call; the enforce_capacity trigger rejects bookings that would oversell the slot
+        reservation_data = {
+            'rid': data.restaurant_id,
+            'rdate': data.date.isoformat(),
+            'rtime': data.time,
+            'party': data.party_size,
+            'email': data.user_email,
+            'uname': data.user_name
+        }
         
-        if not restaurant_result.data:
-            logger.warning(f"Restaurant not found for reservation: {data.restaurant_id}")
+        logger.debug("Creating reservation with data: %s", reservation_data)
+        try:
+            result = supabase.rpc('create_reservation_if_available', reservation_data).execute().data or {}
+        except APIError as e:
+            # The enforce_capacity trigger rejects overbooking with a check violation
+            if e.code != '23514':
+                raise
+            logger.warning(f"Insufficient capacity for reservation - {e.message} Requested: {data.party_size}")
+            evict_slot(data)
             return jsonify({
                 'success': False,
-                'error': 'Restaurant not found'
-            }), 404
-        
-        restaurant = restaurant_result.data[0]
-        
-        # Check availability before creating reservation
-        logger.debug(f"Checking availability before creating reservation")
-        reservations = supabase.table('reservations')\
-                      .select('party_size')\
-                      .eq('restaurant_id', data.restaurant_id)\
-                      .eq('reservation_date', data.date.isoformat())\
-                      .eq('reservation_time', data.time)\
-                      .execute().data
-        
-        total_reserved = sum(r['party_size'] for r in reservations)
-        available_capacity = restaurant['capacity'] - total_reserved
+                'error': e.message
+            }), 409
+        status = result.get('status')
         
-        if available_capacity < data.party_size:
-            logger.warning(f"Insufficient capacity for reservation - Available: {available_capacity}, "
-                          f"Requested: {data.party_size}")
+        if status == 'not_found':
+            logger.warning(f"Restaurant not found for reservation: {data.restaurant_id}")
             return jsonify({
                 'success': False,
-                'error': f'No available capacity. Only {available_capacity} seats available.'
-            }), 409
-        
-        # Create reservation
-        reservation_data = {
-            'restaurant_id': data.restaurant_id,
-            'user_email': data.user_email,
-            'user_name': data.user_name,
-            'party_size': data.party_size,
-            'reservation_date': data.date.isoformat(),
-            'reservation_time': data.time
-        }
-        
-        logger.debug(f"Creating reservation with data: {reservation_data}")
-        result = supabase.table('reservations').insert(reservation_data).execute()
+                'error': 'Restaurant not found'
+            }), 404
         
-        if result.data:
-            reservation = result.data[0]
-            reservation['restaurant_name'] = restaurant['name']
+        if status == 'created':
+            evict_slot(data)
+            reservation = result['reservation']
+            reservation['restaurant_name'] = result['restaurant_name']
             
-            logger.info(f"Reservation created successfully for {data.user_name} at {restaurant['name']}")
+            logger.info(f"Reservation created successfully for {data.user_name} at {result['restaurant_name']}")
             return jsonify({
                 'success': True,
                 'message': 'Reservation created successfully',
                 'reservation': reservation,
-                'data': reservation
+                'data': reservation,
+                'available_seats': result.get('available_capacity')
             }), 201
         else:
-            logger.error("Reservation creation failed - no data returned")
+            logger.error(f"Reservation creation failed - unexpected result: {result}")
             return jsonify({
                 'success': False,
                 'error': 'Failed to create reservation'
@@ -482,6 +744,7 @@ def not_found(error):
             '/api/recommendations',
             '/api/recommendations/smart',
             '/api/availability',
+            '/api/availability/batch',
             '/api/reservations'
         ]
     }), 404
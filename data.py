@@ -1,5 +1,6 @@
 import os
-import random
+import numpy as np
+from postgrest import ReturnMethod
 from supabase import create_client
 from dotenv import load_dotenv
 
@@ -34,10 +35,27 @@ def chunk_array(array, size):
         chunks.append(array[i:i + size])
     return chunks
 
+suffixes = ['Bistro', 'Cafe', 'Restaurant', 'Kitchen', 'Grill']
+streets = ['Main St', 'Oak Ave', 'Park Blvd', 'First St', 'Broadway', 'Market St', 'Union Ave']
+price_ranges = ['$', '$$', '$$$', '$$$$']
+
+# Draw every random field for all 5000 entries up front
+total = 5000
+rng = np.random.default_rng()
+cuisine_idx = rng.integers(0, len(cuisines), total)
+name_picks = rng.random(total)
+suffix_idx = rng.integers(0, len(suffixes), total)
+city_idx = rng.integers(0, len(cities), total)
+street_nums = rng.integers(100, 10000, total)
+street_idx = rng.integers(0, len(streets), total)
+capacities = rng.integers(25, 251, total)
+price_idx = rng.integers(0, len(price_ranges), total)
+ratings = np.round(rng.uniform(3.2, 5.0, total), 1)
+
 # Generate 5000 restaurant entries
 restaurants = []
-for i in range(5000):
-    cuisine = random.choice(cuisines)
+for i in range(total):
+    cuisine = cuisines[cuisine_idx[i]]
     base_names = restaurant_names[cuisine]
     
     # Create unique restaurant names
@@ -47,17 +65,17 @@ for i in range(5000):
         name = base_names[name_index]
         city = cities[city_index]
     else:
-        name = random.choice(base_names) + f" {random.choice(['Bistro', 'Cafe', 'Restaurant', 'Kitchen', 'Grill'])}"
-        city = random.choice(cities)
+        name = f"{base_names[int(name_picks[i] * len(base_names))]} {suffixes[suffix_idx[i]]}"
+        city = cities[city_idx[i]]
     
     restaurant = {
         'name': name,
         'cuisine': cuisine,
-        'location': f"{random.randint(100, 9999)} {random.choice(['Main St', 'Oak Ave', 'Park Blvd', 'First St', 'Broadway', 'Market St', 'Union Ave'])}",
+        'location': f"{street_nums[i]} {streets[street_idx[i]]}",
         'city': city,
-        'capacity': random.randint(25, 250),
-        'price_range': random.choice(['$', '$$', '$$$', '$$$$']),
-        'rating': round(random.uniform(3.2, 5.0), 1)
+        'capacity': int(capacities[i]),
+        'price_range': price_ranges[price_idx[i]],
+        'rating': float(ratings[i])
     }
     restaurants.append(restaurant)
 
@@ -75,7 +93,8 @@ try:
     
     for i, chunk in enumerate(chunks):
         print(f"Inserting chunk {i+1}/{len(chunks)} ({len(chunk)} restaurants)...")
-        result = supabase.table('restaurants').insert(chunk).execute()
+        # Skip echoing the inserted rows back; the count below verifies the load
+        supabase.table('restaurants').insert(chunk, returning=ReturnMethod.minimal).execute()
         total_inserted += len(chunk)
         print(f"Successfully inserted {len(chunk)} restaurants. Total: {total_inserted}")
     
@@ -1,7 +1,31 @@
-bind = "0.0.0.0:8000"
-workers = 2
-worker_class = "sync"
+import os
+import subprocess
+import sys
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("GUNICORN_WORKERS", "4"))
+# gevent workers monkey-patch sockets before loading the app, so a request
+# waiting on Supabase yields to the others; set GUNICORN_WORKER_CLASS=gthread
+# to fall back to threads.
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gevent")
+worker_connections = 1000
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
 timeout = 120
 keepalive = 5
 max_requests = 1000
 max_requests_jitter = 100
+
+# One Realtime listener per deployment, started by the master (outside gevent's
+# monkey-patching); it retires /api/restaurants cache entries through Redis.
+realtime_listener = None
+
+def when_ready(server):
+    global realtime_listener
+    if os.getenv("REALTIME_CACHE_INVALIDATION", "false").lower() == "true":
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "realtime_listener.py")
+        realtime_listener = subprocess.Popen([sys.executable, script])
+        server.log.info("Started realtime listener (pid %s)", realtime_listener.pid)
+
+def on_exit(server):
+    if realtime_listener is not None:
+        realtime_listener.terminate()
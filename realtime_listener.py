@@ -0,0 +1,26 @@
+"""
+Standalone Realtime listener that retires cached /api/restaurants responses.
+
+Run exactly one per deployment (gunicorn_config.py starts it from the master when
+REALTIME_CACHE_INVALIDATION=true). It bumps the generation key in the cache the API
+workers share, so REDIS_URL must be set.
+"""
+import asyncio
+import logging
+import os
+import sys
+from app import app, invalidate_restaurants_cache
+from supabase_client import watch_table
+
+logger = logging.getLogger(__name__)
+
+def main() -> int:
+    if not os.getenv('REDIS_URL'):
+        logger.error("REDIS_URL is not set; an in-process cache cannot reach the API workers")
+        return 1
+    with app.app_context():
+        asyncio.run(watch_table('restaurants', invalidate_restaurants_cache))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,8 +1,8 @@
 import time
 import logging
+from datetime import date
 from typing import Dict, List, Optional, Any
-from supabase import create_client
-import os
+from supabase_client import get_supabase
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -22,10 +22,7 @@ class RecommendationEngine:
     def __init__(self):
         """Initialize the recommendation engine with Supabase connection."""
         try:
-            self.supabase = create_client(
-                os.getenv("SUPABASE_URL"), 
-                os.getenv("SUPABASE_ANON_KEY")
-            )
+            self.supabase = get_supabase()
             logger.info("Recommendation engine initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize recommendation engine: {e}")
@@ -45,169 +42,77 @@ class RecommendationEngine:
         start_time = time.time()
         
         try:
-            # Build base query
-            query = self.supabase.table('restaurants').select('*')
+            # Filtered, scored and ranked in Postgres
+            top_recommendations = self._query_restaurants(preferences, limit)
             
-            # Apply filters based on preferences
-            query = self._apply_filters(query, preferences)
-            
-            # Execute query with ordering
-            result = query.order('rating', desc=True).limit(limit * 2).execute()
-            restaurants = result.data
-            
-            if not restaurants:
+            if not top_recommendations:
                 # Fallback strategy
                 return self._get_fallback_recommendations(preferences, limit, start_time)
             
-            # Score and rank restaurants
-            scored_restaurants = self._score_restaurants(restaurants, preferences)
-            
-            # Select top recommendations
-            top_recommendations = scored_restaurants[:limit]
-            
             response_time = time.time() - start_time
             
-            return {
+            result = {
                 'recommendations': top_recommendations,
                 'fallback_used': False,
-                'total_count': len(restaurants),
+                'total_count': len(top_recommendations),
                 'response_time': response_time,
                 'message': self._generate_message(preferences, len(top_recommendations))
             }
+            if 'available' in top_recommendations[0]:
+                result['available_count'] = sum(r['available'] for r in top_recommendations)
+            return result
             
         except Exception as e:
             logger.error(f"Error in get_recommendations: {e}")
             return self._get_fallback_recommendations(preferences, limit, start_time)
     
-    def _apply_filters(self, query, preferences: Dict[str, Any]):
-        """Apply user preference filters to the query."""
-        
-        # Cuisine filter with fuzzy matching
-        if preferences.get('cuisine'):
-            cuisine = preferences['cuisine']
-            query = query.ilike('cuisine', f"%{cuisine}%")
-            logger.debug(f"Applied cuisine filter: {cuisine}")
-        
-        # Location filter with city matching
-        if preferences.get('city'):
-            city = preferences['city']
-            query = query.ilike('city', f"%{city}%")
-            logger.debug(f"Applied city filter: {city}")
-        
-        # Price range filter with flexibility
-        if preferences.get('price_range'):
-            price_range = preferences['price_range']
-            query = query.eq('price_range', price_range)
-            logger.debug(f"Applied price_range filter: {price_range}")
-        
-        # Rating filter
-        if preferences.get('min_rating'):
-            min_rating = float(preferences['min_rating'])
-            query = query.gte('rating', min_rating)
-            logger.debug(f"Applied min_rating filter: {min_rating}")
-        
-        return query
-    
-    def _score_restaurants(self, restaurants: List[Dict], preferences: Dict[str, Any]) -> List[Dict]:
-        """
-        Score restaurants based on multiple factors and user preferences.
-        
-        Args:
-            restaurants: List of restaurant data
-            preferences: User preferences for scoring
-            
-        Returns:
-            List of restaurants sorted by score (highest first)
-        """
-        scored_restaurants = []
-        
-        for restaurant in restaurants:
-            score = self._calculate_restaurant_score(restaurant, preferences)
-            restaurant['recommendation_score'] = score
-            scored_restaurants.append(restaurant)
-        
-        # Sort by score (highest first)
-        scored_restaurants.sort(key=lambda x: x['recommendation_score'], reverse=True)
-        
-        return scored_restaurants
-    
-    def _calculate_restaurant_score(self, restaurant: Dict, preferences: Dict[str, Any]) -> float:
+    def _query_restaurants(self, preferences: Dict[str, Any], limit: int) -> List[Dict]:
         """
-        Calculate a comprehensive score for a restaurant based on multiple factors.
+        Fetch the best-scoring restaurants for the preferences via the
+        recommend_restaurants RPC, which filters, scores and ranks in one query.
         
-        Scoring factors:
+        Scoring factors (computed in SQL):
         - Rating (40% weight)
         - Cuisine match (25% weight)
         - Price preference (20% weight)
         - Capacity/availability (15% weight)
-        """
-        score = 0.0
-        
-        # Rating score (40% weight) - normalized to 0-40
-        rating = float(restaurant.get('rating', 0))
-        score += (rating / 5.0) * 40
-        
-        # Cuisine match score (25% weight)
-        if preferences.get('cuisine'):
-            preferred_cuisine = preferences['cuisine'].lower()
-            restaurant_cuisine = restaurant.get('cuisine', '').lower()
-            
-            if preferred_cuisine in restaurant_cuisine or restaurant_cuisine in preferred_cuisine:
-                score += 25  # Perfect match
-            elif self._is_related_cuisine(preferred_cuisine, restaurant_cuisine):
-                score += 15  # Related cuisine
-        else:
-            score += 12.5  # Neutral score when no preference
-        
-        # Price preference score (20% weight)
-        if preferences.get('price_range'):
-            preferred_price = preferences['price_range']
-            restaurant_price = restaurant.get('price_range', '')
-            
-            if preferred_price == restaurant_price:
-                score += 20  # Perfect match
-            elif self._is_acceptable_price_range(preferred_price, restaurant_price):
-                score += 10  # Acceptable range
-        else:
-            score += 10  # Neutral score when no preference
-        
-        # Capacity score (15% weight) - favor restaurants with good capacity
-        capacity = restaurant.get('capacity', 0)
-        if capacity >= 100:
-            score += 15  # Large capacity
-        elif capacity >= 50:
-            score += 12  # Medium capacity
-        elif capacity >= 20:
-            score += 8   # Small capacity
-        else:
-            score += 5   # Very small capacity
         
-        return round(score, 2)
-    
-    def _is_related_cuisine(self, cuisine1: str, cuisine2: str) -> bool:
-        """Check if two cuisines are related."""
-        related_cuisines = {
-            'italian': ['mediterranean', 'european'],
-            'french': ['european', 'mediterranean'],
-            'chinese': ['asian', 'japanese', 'thai'],
-            'japanese': ['asian', 'chinese', 'thai'],
-            'thai': ['asian', 'chinese', 'japanese'],
-            'indian': ['asian', 'thai'],
-            'mexican': ['american', 'latin'],
-            'american': ['mexican', 'latin']
+        When the preferences name a slot (ISO date and time), recommend_with_availability
+        is used instead and each row also carries 'available' for the party size.
+        Results are not cached here; the API memoizes them per preference set.
+        """
+        params = {
+            'p_cuisine': preferences.get('cuisine') or None,
+            'p_city': preferences.get('city') or None,
+            'p_price_range': preferences.get('price_range') or None,
+            'p_min_rating': float(preferences['min_rating']) if preferences.get('min_rating') else None,
+            'p_limit': limit
         }
         
-        return cuisine2 in related_cuisines.get(cuisine1, [])
+        slot_date = self._parse_slot_date(preferences)
+        if slot_date and preferences.get('time'):
+            params.update({
+                'p_date': slot_date.isoformat(),
+                'p_time': preferences['time'],
+                'p_party_size': int(preferences.get('party_size', 2))
+            })
+            logger.debug("Querying recommendations with availability: %s", params)
+            return self.supabase.rpc('recommend_with_availability', params).execute().data
+        
+        logger.debug("Querying recommendations with params: %s", params)
+        return self.supabase.rpc('recommend_restaurants', params).execute().data
     
-    def _is_acceptable_price_range(self, preferred: str, restaurant: str) -> bool:
-        """Check if restaurant price range is acceptable based on preference."""
-        price_levels = {'$': 1, '$$': 2, '$$$': 3, '$$$$': 4}
-        
-        preferred_level = price_levels.get(preferred, 2)
-        restaurant_level = price_levels.get(restaurant, 2)
-        
-        # Accept within 1 level difference
-        return abs(preferred_level - restaurant_level) <= 1
+    @staticmethod
+    def _parse_slot_date(preferences: Dict[str, Any]) -> Optional[date]:
+        """Return the preferred reservation date, or None when absent or not ISO formatted."""
+        value = preferences.get('date')
+        if isinstance(value, date):
+            return value
+        try:
+            return date.fromisoformat(str(value)) if value else None
+        except ValueError:
+            logger.debug("Ignoring unparseable date preference: %s", value)
+            return None
     
     def _get_fallback_recommendations(self, preferences: Dict[str, Any], limit: int, start_time: float) -> Dict[str, Any]:
         """
@@ -222,37 +127,29 @@ class RecommendationEngine:
         
         try:
             # Strategy 1: Broader search with relaxed filters
-            query = self.supabase.table('restaurants').select('*')
-            
-            # Only apply rating filter if specified
             if preferences.get('min_rating'):
                 min_rating = max(3.0, float(preferences['min_rating']) - 1.0)  # Relax by 1 star
-                query = query.gte('rating', min_rating)
             else:
-                query = query.gte('rating', 3.5)  # Default to good restaurants
-            
-            result = query.order('rating', desc=True).limit(limit).execute()
+                min_rating = 3.5  # Default to good restaurants
             
-            if result.data:
-                response_time = time.time() - start_time
-                return {
-                    'recommendations': result.data,
-                    'fallback_used': True,
-                    'total_count': len(result.data),
-                    'response_time': response_time,
-                    'message': self._generate_fallback_message(preferences)
-                }
+            # Strategy 2 (any restaurants) runs in the same call when strategy 1 finds nothing
+            rows = self.supabase.rpc('fallback_recommend', {
+                'p_min_rating': min_rating,
+                'p_limit': limit
+            }).execute().data
             
-            # Strategy 2: Get any restaurants if nothing found
-            result = self.supabase.table('restaurants').select('*').limit(limit).execute()
+            broad = not rows or rows[0]['source'] == 'broad'
+            for row in rows:
+                del row['source']
             
             response_time = time.time() - start_time
             return {
-                'recommendations': result.data,
+                'recommendations': rows,
                 'fallback_used': True,
-                'total_count': len(result.data),
+                'total_count': len(rows),
                 'response_time': response_time,
-                'message': "Here are some popular restaurants you might enjoy"
+                'message': "Here are some popular restaurants you might enjoy" if broad
+                           else self._generate_fallback_message(preferences)
             }
             
         except Exception as e:
@@ -1,11 +1,14 @@
 import streamlit as st
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
 from datetime import datetime, date, timedelta
-import pandas as pd
 import logging
+import re
 from ai_agent import ai_agent
 import os
+from pathlib import Path
 from dotenv import load_dotenv
 
 # Configure logging
@@ -25,391 +28,44 @@ load_dotenv()
 API_BASE_URL = os.getenv('API_BASE_URL', 'https://foodiespot-vzs5.onrender.com/api')
 
 # Enhanced Responsive CSS with Professional Food Theme
-st.markdown("""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&family=Playfair+Display:wght@400;500;600;700;800&family=Roboto:wght@300;400;500;600;700&display=swap');
-    
-    /* Global Reset with Enhanced Food Colors */
-    .stApp {
-        background: linear-gradient(135deg, 
-            rgba(215, 53, 39, 0.08) 0%,
-            rgba(244, 162, 97, 0.06) 20%,
-            rgba(139, 90, 60, 0.08) 40%,
-            rgba(205, 133, 63, 0.06) 60%,
-            rgba(160, 82, 45, 0.08) 80%,
-            rgba(218, 165, 32, 0.06) 100%
-        );
-        background-attachment: fixed;
-        font-family: 'Inter', sans-serif;
-        font-weight: 400;
-        color: #2c1810;
-    }
-    
-    /* Enhanced Navigation Header */
-    .nav-header {
-        background: rgba(255, 255, 255, 0.35);
-        backdrop-filter: blur(30px);
-        border: 2px solid rgba(215, 53, 39, 0.25);
-        border-radius: 25px;
-        padding: 2rem 2.5rem;
-        margin-bottom: 2.5rem;
-        box-shadow: 0 20px 60px rgba(215, 53, 39, 0.12);
-        position: sticky;
-        top: 0.5rem;
-        z-index: 100;
-    }
-    
-    .nav-title {
-        font-family: 'Playfair Display', serif;
-        font-size: clamp(2.5rem, 5vw, 4.5rem);
-        font-weight: 800;
-        background: linear-gradient(135deg, #d73527 0%, #e76f51 25%, #f4a261 50%, #e9c46a 75%, #daa520 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        text-align: center;
-        margin: 0;
-        letter-spacing: -1px;
-    }
-    
-    .nav-subtitle {
-        text-align: center;
-        color: rgba(139, 90, 60, 0.9);
-        font-size: clamp(1rem, 2.5vw, 1.4rem);
-        margin-top: 0.8rem;
-        font-weight: 500;
-        font-family: 'Roboto', sans-serif;
-        letter-spacing: 0.5px;
-    }
-    
-    /* Enhanced Glass Cards */
-    .glass-card {
-        background: rgba(255, 255, 255, 0.35);
-        backdrop-filter: blur(25px);
-        border: 2px solid rgba(215, 53, 39, 0.2);
-        border-radius: 20px;
-        padding: clamp(1.5rem, 4vw, 3rem);
-        margin: clamp(1rem, 3vw, 2.5rem) 0;
-        box-shadow: 0 15px 50px rgba(215, 53, 39, 0.1);
-        transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1);
-        position: relative;
-        overflow: hidden;
-    }
-    
-    .glass-card:hover {
-        transform: translateY(-8px);
-        box-shadow: 0 25px 70px rgba(215, 53, 39, 0.15);
-        border-color: rgba(215, 53, 39, 0.4);
-    }
-    
-    /* Enhanced Restaurant Cards */
-    .restaurant-card {
-        background: rgba(255, 255, 255, 0.3);
-        backdrop-filter: blur(20px);
-        border: 2px solid rgba(215, 53, 39, 0.25);
-        border-radius: 18px;
-        padding: clamp(1.2rem, 3vw, 2.5rem);
-        margin: clamp(1rem, 2vw, 2rem) 0;
-        transition: all 0.4s ease;
-        position: relative;
-        overflow: hidden;
-    }
-    
-    .restaurant-card:hover {
-        transform: translateY(-6px) scale(1.02);
-        box-shadow: 0 20px 60px rgba(215, 53, 39, 0.2);
-        background: rgba(255, 255, 255, 0.4);
-        border-color: rgba(215, 53, 39, 0.4);
-    }
-    
-    .restaurant-name {
-        font-family: 'Playfair Display', serif;
-        font-size: clamp(1.4rem, 3vw, 2.2rem);
-        font-weight: 700;
-        color: #8b5a3c;
-        margin-bottom: 0.8rem;
-        letter-spacing: -0.5px;
-    }
-    
-    .restaurant-details {
-        color: rgba(139, 90, 60, 0.9);
-        line-height: 1.7;
-        font-size: clamp(0.9rem, 2vw, 1.1rem);
-        font-family: 'Roboto', sans-serif;
-        font-weight: 500;
-    }
-    
-    /* Enhanced AI Chat Interface */
-    .chat-container {
-        background: rgba(255, 255, 255, 0.35);
-        backdrop-filter: blur(30px);
-        border: 2px solid rgba(215, 53, 39, 0.25);
-        border-radius: 25px;
-        padding: clamp(1.5rem, 4vw, 3rem);
-        min-height: clamp(400px, 60vh, 700px);
-        position: relative;
-        box-shadow: 0 20px 60px rgba(215, 53, 39, 0.1);
-    }
-    
-    /* AI Chat Messages */
-    .stChatMessage {
-        background: rgba(255, 255, 255, 0.4) !important;
-        backdrop-filter: blur(15px) !important;
-        border: 1px solid rgba(215, 53, 39, 0.2) !important;
-        border-radius: 15px !important;
-        margin: 0.8rem 0 !important;
-        padding: 1.2rem !important;
-        box-shadow: 0 4px 15px rgba(215, 53, 39, 0.08) !important;
-    }
-    
-    .stChatMessage[data-testid="user-message"] {
-        background: linear-gradient(135deg, rgba(215, 53, 39, 0.15), rgba(244, 162, 97, 0.15)) !important;
-        border-color: rgba(215, 53, 39, 0.3) !important;
-        margin-left: 10% !important;
-    }
-    
-    .stChatMessage[data-testid="assistant-message"] {
-        background: linear-gradient(135deg, rgba(255, 255, 255, 0.5), rgba(248, 248, 248, 0.5)) !important;
-        border-color: rgba(139, 90, 60, 0.3) !important;
-        margin-right: 10% !important;
-    }
-    
-    /* Chat Input Styling */
-    .stChatInput > div > div > div {
-        background: rgba(255, 255, 255, 0.4) !important;
-        backdrop-filter: blur(20px) !important;
-        border: 2px solid rgba(215, 53, 39, 0.3) !important;
-        border-radius: 15px !important;
-        font-family: 'Roboto', sans-serif !important;
-        font-size: 1.1rem !important;
-        font-weight: 500 !important;
-        color: #8b5a3c !important;
-    }
-    
-    .stChatInput > div > div > div:focus {
-        border-color: rgba(215, 53, 39, 0.6) !important;
-        box-shadow: 0 0 0 3px rgba(215, 53, 39, 0.1) !important;
-    }
-    
-    /* Enhanced Buttons */
-    .stButton > button {
-        background: linear-gradient(135deg, 
-            rgba(215, 53, 39, 0.9) 0%, 
-            rgba(231, 111, 81, 0.9) 30%, 
-            rgba(244, 162, 97, 0.9) 70%, 
-            rgba(218, 165, 32, 0.9) 100%
-        );
-        backdrop-filter: blur(15px);
-        border: 2px solid rgba(255, 255, 255, 0.3);
-        border-radius: 12px;
-        color: white;
-        font-weight: 700;
-        font-family: 'Roboto', sans-serif;
-        padding: clamp(0.8rem, 2vw, 1.2rem) clamp(1.5rem, 4vw, 3rem);
-        transition: all 0.4s ease;
-        box-shadow: 0 8px 25px rgba(215, 53, 39, 0.25);
-        text-shadow: 1px 1px 2px rgba(0,0,0,0.3);
-        font-size: clamp(0.9rem, 2vw, 1.1rem);
-        letter-spacing: 0.5px;
-        text-transform: uppercase;
-        width: 100%;
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-3px) scale(1.02);
-        box-shadow: 0 15px 40px rgba(215, 53, 39, 0.35);
-        background: linear-gradient(135deg, 
-            rgba(183, 45, 33, 0.95) 0%, 
-            rgba(207, 100, 73, 0.95) 30%, 
-            rgba(220, 146, 87, 0.95) 70%, 
-            rgba(184, 140, 27, 0.95) 100%
-        );
-    }
-    
-    /* Enhanced Form Elements */
-    .stTextInput > div > div > input,
-    .stSelectbox > div > div > div,
-    .stNumberInput > div > div > input,
-    .stTextArea > div > div > textarea,
-    .stDateInput > div > div > input,
-    .stTimeInput > div > div > input {
-        background: rgba(255, 255, 255, 0.35) !important;
-        backdrop-filter: blur(15px) !important;
-        border: 2px solid rgba(215, 53, 39, 0.25) !important;
-        border-radius: 10px !important;
-        color: #8b5a3c !important;
-        font-family: 'Roboto', sans-serif !important;
-        font-weight: 500 !important;
-        font-size: clamp(0.9rem, 2vw, 1.1rem) !important;
-        padding: clamp(0.6rem, 2vw, 1rem) !important;
-        transition: all 0.3s ease !important;
-    }
-    
-    .stTextInput > div > div > input:focus,
-    .stSelectbox > div > div > div:focus,
-    .stNumberInput > div > div > input:focus,
-    .stTextArea > div > div > textarea:focus,
-    .stDateInput > div > div > input:focus,
-    .stTimeInput > div > div > input:focus {
-        border-color: rgba(215, 53, 39, 0.5) !important;
-        box-shadow: 0 0 0 3px rgba(215, 53, 39, 0.1) !important;
-        transform: scale(1.01) !important;
-    }
-    
-    /* Enhanced Metrics */
-    .metric-card {
-        background: rgba(255, 255, 255, 0.3);
-        backdrop-filter: blur(20px);
-        border: 2px solid rgba(215, 53, 39, 0.25);
-        border-radius: 18px;
-        padding: clamp(1.2rem, 3vw, 2.5rem);
-        text-align: center;
-        transition: all 0.4s ease;
-        position: relative;
-        overflow: hidden;
-        box-shadow: 0 10px 30px rgba(215, 53, 39, 0.1);
-    }
-    
-    .metric-card:hover {
-        transform: translateY(-6px) scale(1.03);
-        box-shadow: 0 20px 50px rgba(215, 53, 39, 0.2);
-        border-color: rgba(215, 53, 39, 0.4);
-    }
-    
-    .metric-value {
-        font-family: 'Playfair Display', serif;
-        font-size: clamp(2rem, 5vw, 3.2rem);
-        font-weight: 800;
-        color: #d73527;
-        margin-bottom: 0.8rem;
-        text-shadow: 1px 1px 3px rgba(0,0,0,0.1);
-    }
-    
-    .metric-label {
-        color: rgba(139, 90, 60, 0.8);
-        font-size: clamp(0.8rem, 2vw, 1.1rem);
-        font-weight: 600;
-        font-family: 'Roboto', sans-serif;
-        letter-spacing: 0.3px;
-        text-transform: uppercase;
-    }
-    
-    /* Success/Error Messages */
-    .success-message {
-        background: rgba(76, 175, 80, 0.25);
-        backdrop-filter: blur(15px);
-        border: 2px solid rgba(76, 175, 80, 0.4);
-        border-radius: 15px;
-        padding: clamp(1rem, 3vw, 2rem);
-        color: #1b5e20;
-        margin: clamp(1rem, 2vw, 2rem) 0;
-        font-family: 'Roboto', sans-serif;
-        font-weight: 600;
-        font-size: clamp(1rem, 2vw, 1.2rem);
-        box-shadow: 0 8px 25px rgba(76, 175, 80, 0.15);
-    }
-    
-    .error-message {
-        background: rgba(255, 87, 34, 0.25);
-        backdrop-filter: blur(15px);
-        border: 2px solid rgba(255, 87, 34, 0.4);
-        border-radius: 15px;
-        padding: clamp(1rem, 3vw, 2rem);
-        color: #bf360c;
-        margin: clamp(1rem, 2vw, 2rem) 0;
-        font-family: 'Roboto', sans-serif;
-        font-weight: 600;
-        font-size: clamp(1rem, 2vw, 1.2rem);
-        box-shadow: 0 8px 25px rgba(255, 87, 34, 0.15);
-    }
-    
-    /* Responsive Design */
-    @media (max-width: 768px) {
-        .nav-header { 
-            padding: 1.2rem 1.5rem; 
-            margin-bottom: 2rem;
-        }
-        .glass-card { 
-            padding: 1.5rem; 
-            margin: 1rem 0; 
-            border-radius: 15px;
-        }
-        .restaurant-card { 
-            padding: 1.2rem; 
-            margin: 1rem 0;
-            border-radius: 15px;
-        }
-        .chat-container {
-            padding: 1.5rem;
-            min-height: 400px;
-            border-radius: 20px;
-        }
-        .stChatMessage {
-            margin: 0.5rem 0 !important;
-            padding: 1rem !important;
-            border-radius: 12px !important;
-        }
-        .stChatMessage[data-testid="user-message"] {
-            margin-left: 5% !important;
-        }
-        .stChatMessage[data-testid="assistant-message"] {
-            margin-right: 5% !important;
-        }
-    }
-    
-    /* Status indicators */
-    .status-indicator {
-        display: inline-flex;
-        align-items: center;
-        gap: 0.5rem;
-        padding: 0.5rem 1rem;
-        border-radius: 20px;
-        font-size: 0.9rem;
-        font-weight: 600;
-        margin: 0.5rem 0;
-    }
-    
-    .status-online {
-        background: rgba(76, 175, 80, 0.2);
-        color: #2e7d32;
-        border: 1px solid rgba(76, 175, 80, 0.4);
-    }
-    
-    .status-offline {
-        background: rgba(244, 67, 54, 0.2);
-        color: #c62828;
-        border: 1px solid rgba(244, 67, 54, 0.4);
-    }
-    
-    .status-warning {
-        background: rgba(255, 152, 0, 0.2);
-        color: #ef6c00;
-        border: 1px solid rgba(255, 152, 0, 0.4);
-    }
-</style>
-""", unsafe_allow_html=True)
+@st.cache_resource
+def load_css():
+    """Read the stylesheet once per process instead of on every rerun"""
+    return (Path(__file__).parent / "assets" / "app.css").read_text(encoding="utf-8")
+
+# Fonts load through <link> tags so the stylesheet doesn't block on a CSS @import;
+# only the weights the stylesheet and page markup use are requested
+FONT_LINKS = (
+    '<link rel="preconnect" href="https://fonts.googleapis.com">'
+    '<link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>'
+    '<link rel="stylesheet" href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700'
+    '&family=Playfair+Display:wght@600;700;800&family=Roboto:wght@500;600;700&display=swap">'
+)
+
+st.markdown(f"{FONT_LINKS}<style>{load_css()}</style>", unsafe_allow_html=True)
+
+WELCOME_MESSAGE = "Welcome to FoodieSpot! I'm your AI dining concierge ready to help you discover exceptional culinary experiences. What type of cuisine are you craving today?"
+
+# Session defaults; mutable values are factories so each session gets its own copy
+DEFAULT_SESSION_STATE = {
+    'messages': lambda: [{"role": "assistant", "content": WELCOME_MESSAGE}],
+    'restaurants': list,
+    'selected_restaurant': None,
+    'search_filters': dict,
+    'booking_data': dict,
+    'last_cuisine_search': None,
+    'last_city_search': None,
+    'ai_agent_ready': False,
+    'conversation_context': list,
+    'system_status': None
+}
 
 # Enhanced session state initialization with AI agent compatibility
 def initialize_session_state():
     """Initialize session state with AI agent compatibility"""
-    default_states = {
-        'messages': [{"role": "assistant", "content": "Welcome to FoodieSpot! I'm your AI dining concierge ready to help you discover exceptional culinary experiences. What type of cuisine are you craving today?"}],
-        'restaurants': [],
-        'selected_restaurant': None,
-        'current_page': "Home",
-        'search_filters': {},
-        'booking_data': {},
-        'last_api_call': None,
-        'last_cuisine_search': None,
-        'last_city_search': None,
-        'ai_agent_ready': False,
-        'conversation_context': [],
-        'system_status': None,
-        'cached_restaurants': None
-    }
-    
-    for key, default_value in default_states.items():
+    for key, default_value in DEFAULT_SESSION_STATE.items():
         if key not in st.session_state:
-            st.session_state[key] = default_value
+            st.session_state[key] = default_value() if callable(default_value) else default_value
     
     # Check AI agent availability
     try:
@@ -423,98 +79,174 @@ def initialize_session_state():
         st.session_state.ai_agent_ready = False
         logger.error(f"Error checking AI agent: {e}")
 
+@st.cache_resource
+def get_http_session():
+    """Keep-alive HTTP session shared across reruns and sessions"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50,
+                          max_retries=Retry(total=2, backoff_factor=0.1))
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+# POST endpoints that only read data; reservations must always reach the API
+CACHEABLE_POST_ENDPOINTS = {"recommendations", "recommendations/smart"}
+
+def _call_api(method, endpoint, data_key):
+    """Perform the API call; errors propagate so failed responses are never cached"""
+    url = f"{API_BASE_URL}/{endpoint}"
+    logger.info(f"Making {method} request to {url}")
+    
+    session = get_http_session()
+    if method == "GET":
+        response = session.get(url, timeout=15)
+    elif method == "POST":
+        response = session.post(url, data=orjson.dumps(dict(data_key or ())), timeout=15,
+                                headers={'Content-Type': 'application/json'})
+    else:
+        raise ValueError(f"Unsupported method: {method}")
+    
+    if response.status_code not in [200, 201]:
+        raise requests.exceptions.HTTPError(f"API Error: {response.status_code}", response=response)
+    return orjson.loads(response.content)
+
+@st.cache_data(ttl=60, max_entries=128, show_spinner=False)
+def _cached_api(method, endpoint, data_key):
+    """Responses shared across reruns and sessions for a minute"""
+    return _call_api(method, endpoint, data_key)
+
 # Enhanced API functions with better error handling
 def make_api_request(endpoint, method="GET", data=None):
     """Make API requests with enhanced error handling and caching"""
+    data_key = tuple(sorted(data.items())) if data else None
     try:
-        url = f"{API_BASE_URL}/{endpoint}"
-        logger.info(f"Making {method} request to {url}")
-        
-        # Simple caching mechanism
-        cache_key = f"{method}_{endpoint}_{str(data)}"
-        if cache_key == st.session_state.get('last_api_call'):
-            return st.session_state.get('last_api_result')
-        
-        if method == "GET":
-            response = requests.get(url, timeout=15)
-        elif method == "POST":
-            response = requests.post(url, json=data, timeout=15)
-        
-        if response.status_code in [200, 201]:
-            result = response.json()
-            st.session_state['last_api_call'] = cache_key
-            st.session_state['last_api_result'] = result
-            return result
-        else:
-            logger.error(f"API Error: {response.status_code}")
-            return None
-            
+        if method == "GET" or endpoint in CACHEABLE_POST_ENDPOINTS:
+            return _cached_api(method, endpoint, data_key)
+        return _call_api(method, endpoint, data_key)
     except requests.exceptions.ConnectionError:
         logger.error("Connection error to API")
         return None
     except requests.exceptions.Timeout:
         logger.error("API request timeout")
         return None
+    except requests.exceptions.HTTPError as e:
+        logger.error(str(e))
+        return None
     except Exception as e:
         logger.error(f"API request failed: {str(e)}")
         return None
 
+@st.cache_data(ttl=300, show_spinner=False)
+def _fetch_restaurants():
+    """Restaurant list shared by all sessions; raises so failures are not cached"""
+    result = _call_api("GET", "restaurants", None)
+    if not result.get('success'):
+        raise ValueError(result.get('error', 'restaurant list unavailable'))
+    return result['data']
+
 def get_restaurants_from_api():
     """Get restaurants with caching"""
-    if st.session_state.cached_restaurants is None:
-        result = make_api_request("restaurants")
-        if result and result.get('success'):
-            st.session_state.cached_restaurants = result['data']
-            return result['data']
+    try:
+        return _fetch_restaurants()
+    except Exception as e:
+        logger.error(f"Failed to load restaurants: {e}")
+        return []
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _featured_restaurants(n):
+    """First few restaurants for the home page, so reruns don't copy the full list"""
+    return _fetch_restaurants()[:n]
+
+def get_featured_restaurants(n=6):
+    """Get featured restaurants with caching"""
+    try:
+        return _featured_restaurants(n)
+    except Exception as e:
+        logger.error(f"Failed to load featured restaurants: {e}")
         return []
-    return st.session_state.cached_restaurants
+
+@st.cache_data(ttl=120, max_entries=256, show_spinner=False)
+def _cached_recommendations(pref_key):
+    """Recommendations per preference set; raises so failures are not cached"""
+    result = _call_api("POST", "recommendations", pref_key)
+    if not result.get('success'):
+        raise ValueError(result.get('error', 'recommendations unavailable'))
+    return result
+
+def get_recommendations_from_api(preferences):
+    """Get recommendations for the preferences, reusing results for identical preferences"""
+    try:
+        return _cached_recommendations(tuple(sorted(preferences.items())))
+    except Exception as e:
+        logger.error(f"Failed to load recommendations: {e}")
+        return None
+
+GREETING_RE = re.compile(r"(hi|hello|hey|good (morning|afternoon|evening)|thanks|thank you)\W*", re.IGNORECASE)
+
+GREETING_REPLY = "Happy to help! Ask me to find restaurants by cuisine or city, check availability, or book a table."
 
 # Enhanced AI agent processing with full Supabase integration
-def process_user_input_with_ai(user_input: str):
-    """Enhanced AI agent processing with Supabase integration"""
+def stream_user_input_with_ai(user_input: str):
+    """Stream the AI agent response token by token, with rule-based fallback"""
+    # Empty input and bare greetings don't need an LLM round-trip
+    stripped = user_input.strip()
+    if not stripped:
+        yield "Please provide a message. How can I help you with restaurants today?"
+        return
+    if GREETING_RE.fullmatch(stripped):
+        yield GREETING_REPLY
+        return
+    
+    if not st.session_state.ai_agent_ready or ai_agent is None:
+        yield handle_fallback_response(user_input)
+        return
+    
     try:
-        if not st.session_state.ai_agent_ready or ai_agent is None:
-            return handle_fallback_response(user_input)
-        
         # Use the AI agent with full tool integration
-        response = ai_agent.chat(user_input)
-        
-        # Update session state with any restaurant data from AI agent
-        if hasattr(ai_agent, 'last_search_results') and ai_agent.last_search_results:
-            st.session_state.restaurants = ai_agent.last_search_results[:10]
-        
-        return response
-        
+        yield from ai_agent.stream_chat(user_input)
     except Exception as e:
         logger.error(f"AI agent error: {e}")
-        return handle_fallback_response(user_input)
+        yield handle_fallback_response(user_input)
+        return
+    
+    # Update session state with any restaurant data from AI agent
+    if hasattr(ai_agent, 'last_search_results') and ai_agent.last_search_results:
+        st.session_state.restaurants = ai_agent.last_search_results[:10]
+
+# Intent keywords, matched as substrings like the original checks; one scan finds every intent
+INTENT_RE = re.compile(
+    r"(?P<search>find|search|restaurant|food|cuisine)"
+    r"|(?P<book>book|reserve|table)"
+    r"|(?P<recommend>recommend|suggest|best)"
+    r"|(?P<status>status|health|system)",
+    re.IGNORECASE
+)
 
 # Enhanced fallback response handler
 def handle_fallback_response(user_input):
     """Fallback response handler when AI agent fails"""
-    user_input_lower = user_input.lower()
+    intents = {match.lastgroup for match in INTENT_RE.finditer(user_input)}
     
-    if any(word in user_input_lower for word in ['find', 'search', 'restaurant', 'food', 'cuisine']):
+    if 'search' in intents:
         return handle_restaurant_search(user_input)
-    elif any(word in user_input_lower for word in ['book', 'reserve', 'table']):
+    elif 'book' in intents:
         return "I'd be delighted to help you secure a table! Please navigate to our 'Reserve Table' section to complete your booking with our streamlined reservation system."
-    elif any(word in user_input_lower for word in ['recommend', 'suggest', 'best']):
+    elif 'recommend' in intents:
         return handle_recommendation_request(user_input)
-    elif any(word in user_input_lower for word in ['status', 'health', 'system']):
+    elif 'status' in intents:
         return check_system_status_text()
     else:
         return "I'm here to enhance your dining journey! I can help you discover exceptional restaurants, make seamless reservations, or provide personalized recommendations based on your preferences. What culinary adventure shall we plan today?"
 
+CUISINE_RE = re.compile(r"\b(italian|mexican|chinese|japanese|french|indian|thai|american)\b", re.IGNORECASE)
+
 def handle_restaurant_search(user_input):
     """Handle restaurant search with fallback"""
-    cuisines = ['italian', 'mexican', 'chinese', 'japanese', 'french', 'indian', 'thai', 'american']
-    found_cuisine = None
+    match = CUISINE_RE.search(user_input)
+    found_cuisine = match.group(1).title() if match else None
     
-    for cuisine in cuisines:
-        if cuisine in user_input.lower():
-            found_cuisine = cuisine.title()
-            st.session_state['last_cuisine_search'] = found_cuisine
-            break
+    if found_cuisine:
+        st.session_state['last_cuisine_search'] = found_cuisine
     
     if found_cuisine:
         endpoint = f"restaurants?cuisine={found_cuisine}"
@@ -541,8 +273,8 @@ def handle_recommendation_request(user_input):
                 'min_rating': 4.0
             }
             
-            result = make_api_request("recommendations", "POST", preferences)
-            if result and result.get('success'):
+            result = get_recommendations_from_api(preferences)
+            if result:
                 restaurants = result['data'][:5]
                 st.session_state.restaurants = restaurants
                 return f"Here are my top recommendations based on your preferences! I found {len(restaurants)} excellent options for you."
@@ -627,31 +359,24 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-# Navigation Tabs with proper state management
-col1, col2, col3, col4 = st.columns(4)
-
-with col1:
-    if st.button("🏠 Home", key="nav_home", use_container_width=True):
-        st.session_state.current_page = "Home"
-        st.rerun()
+HOME_STATS = [
+    ("150+", "Premium Restaurants"),
+    ("50K+", "Satisfied Diners"),
+    ("4.9★", "Average Rating"),
+    ("24/7", "AI Assistance"),
+]
 
-with col2:
-    if st.button("🤖 AI Concierge", key="nav_chat", use_container_width=True):
-        st.session_state.current_page = "Chat"
-        st.rerun()
+# Static home page stats, rendered as one element instead of four columns
+STATS_HTML = '<div class="metric-grid">' + "".join(
+    f'<div class="metric-card"><div class="metric-value">{value}</div>'
+    f'<div class="metric-label">{label}</div></div>'
+    for value, label in HOME_STATS
+) + '</div>'
 
-with col3:
-    if st.button("📋 Reserve Table", key="nav_book", use_container_width=True):
-        st.session_state.current_page = "Booking"
-        st.rerun()
-
-with col4:
-    if st.button("🔍 Discover", key="nav_discover", use_container_width=True):
-        st.session_state.current_page = "Discover"
-        st.rerun()
-
-# Main content based on current page
-if st.session_state.current_page == "Home":
+# Page bodies; each is a fragment so its widgets rerun only that page
+@st.fragment
+def home_page():
+    """Home page with hero section and featured restaurants"""
     # Hero Section
     st.markdown("""
     <div class="glass-card">
@@ -674,39 +399,7 @@ if st.session_state.current_page == "Home":
         st.markdown('<div class="status-indicator status-warning">⚠️ AI Agent Offline - Using Fallback Mode</div>', unsafe_allow_html=True)
     
     # Stats Section
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.markdown("""
-        <div class="metric-card">
-            <div class="metric-value">150+</div>
-            <div class="metric-label">Premium Restaurants</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown("""
-        <div class="metric-card">
-            <div class="metric-value">50K+</div>
-            <div class="metric-label">Satisfied Diners</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown("""
-        <div class="metric-card">
-            <div class="metric-value">4.9★</div>
-            <div class="metric-label">Average Rating</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col4:
-        st.markdown("""
-        <div class="metric-card">
-            <div class="metric-value">24/7</div>
-            <div class="metric-label">AI Assistance</div>
-        </div>
-        """, unsafe_allow_html=True)
+    st.markdown(STATS_HTML, unsafe_allow_html=True)
     
     # Featured Restaurants
     st.markdown("""
@@ -717,7 +410,7 @@ if st.session_state.current_page == "Home":
     </div>
     """, unsafe_allow_html=True)
     
-    restaurants = get_restaurants_from_api()[:6]
+    restaurants = get_featured_restaurants()
     
     if restaurants:
         for i in range(0, len(restaurants), 3):
@@ -739,8 +432,7 @@ if st.session_state.current_page == "Home":
                     
                     if st.button(f"Reserve Now", key=f"home_book_{i}_{j}", use_container_width=True):
                         st.session_state.selected_restaurant = restaurant
-                        st.session_state.current_page = "Booking"
-                        st.rerun()
+                        st.switch_page(PAGES["Booking"])
     else:
         st.markdown("""
         <div class="glass-card">
@@ -750,8 +442,9 @@ if st.session_state.current_page == "Home":
         </div>
         """, unsafe_allow_html=True)
 
-elif st.session_state.current_page == "Chat":
-    
+@st.fragment
+def chat_page():
+    """AI concierge chat page"""
     # Chat header with status
     col1, col2 = st.columns([2, 1])
     with col1:
@@ -765,7 +458,7 @@ elif st.session_state.current_page == "Chat":
             st.session_state.messages = [st.session_state.messages[0]]  # Keep welcome message
             if ai_agent:
                 ai_agent.reset_conversation()
-            st.rerun()
+            st.rerun(scope="fragment")
     
     
     
@@ -791,12 +484,10 @@ elif st.session_state.current_page == "Chat":
                 st.session_state.messages.append({"role": "user", "content": suggestion})
                 
                 with st.chat_message("assistant"):
-                    with st.spinner("🤖 Processing your request..."):
-                        response = process_user_input_with_ai(suggestion)
-                        st.markdown(response)
+                    response = st.write_stream(stream_user_input_with_ai(suggestion))
                 
                 st.session_state.messages.append({"role": "assistant", "content": response})
-                st.rerun()
+                st.rerun(scope="fragment")
     
     # Main chat input
     if prompt := st.chat_input("Ask me about restaurants, make reservations, or get personalized recommendations..."):
@@ -805,17 +496,17 @@ elif st.session_state.current_page == "Chat":
         
         # Process with AI agent
         with st.chat_message("assistant"):
-            with st.spinner("🤖 AI is analyzing your request..."):
-                response = process_user_input_with_ai(prompt)
-                st.markdown(response)
+            response = st.write_stream(stream_user_input_with_ai(prompt))
         
         # Add assistant response
         st.session_state.messages.append({"role": "assistant", "content": response})
-        st.rerun()
+        st.rerun(scope="fragment")
     
     st.markdown('</div>', unsafe_allow_html=True)
 
-elif st.session_state.current_page == "Booking":
+@st.fragment
+def booking_page():
+    """Reservation page with availability check"""
     st.markdown('<div class="glass-card">', unsafe_allow_html=True)
     st.markdown("### 📋 Reserve Your Perfect Table")
     
@@ -836,147 +527,152 @@ elif st.session_state.current_page == "Booking":
     
     restaurant_options = [r['name'] for r in restaurants] if restaurants else ["No restaurants available"]
     
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("#### Restaurant Details")
-        selected_restaurant_name = st.selectbox("🏪 Choose Restaurant", restaurant_options, key="restaurant_select")
+    # One form so the inputs only rerun the page when a button is pressed
+    with st.form("booking_form", clear_on_submit=False):
+        col1, col2 = st.columns(2)
         
-        reservation_date = st.date_input(
-            "📅 Reservation Date",
-            min_value=date.today(),
-            max_value=date.today() + timedelta(days=60),
-            key="reservation_date"
-        )
+        with col1:
+            st.markdown("#### Restaurant Details")
+            selected_restaurant_name = st.selectbox("🏪 Choose Restaurant", restaurant_options, key="restaurant_select")
+        
+            reservation_date = st.date_input(
+                "📅 Reservation Date",
+                min_value=date.today(),
+                max_value=date.today() + timedelta(days=60),
+                key="reservation_date"
+            )
         
-        reservation_time = st.time_input(
-            "🕐 Preferred Time", 
-            value=datetime.now().replace(hour=19, minute=0, second=0, microsecond=0).time(),
-            key="reservation_time"
+            reservation_time = st.time_input(
+                "🕐 Preferred Time", 
+                value=datetime.now().replace(hour=19, minute=0, second=0, microsecond=0).time(),
+                key="reservation_time"
+            )
+        
+        with col2:
+            st.markdown("#### Guest Information")
+            party_size = st.number_input("👥 Party Size", min_value=1, max_value=20, value=2, key="party_size")
+            user_name = st.text_input("👤 Full Name", placeholder="Enter your full name", key="user_name")
+            user_email = st.text_input("📧 Email Address", placeholder="your.email@example.com", key="user_email")
+        
+        special_requests = st.text_area(
+            "📝 Special Requests", 
+            placeholder="Dietary restrictions, seating preferences, special occasions...",
+            key="special_requests"
         )
-    
-    with col2:
-        st.markdown("#### Guest Information")
-        party_size = st.number_input("👥 Party Size", min_value=1, max_value=20, value=2, key="party_size")
-        user_name = st.text_input("👤 Full Name", placeholder="Enter your full name", key="user_name")
-        user_email = st.text_input("📧 Email Address", placeholder="your.email@example.com", key="user_email")
-    
-    special_requests = st.text_area(
-        "📝 Special Requests", 
-        placeholder="Dietary restrictions, seating preferences, special occasions...",
-        key="special_requests"
-    )
-    
-    # Check availability and reservation buttons
-    col1, col2, col3 = st.columns([1, 1, 1])
-    
-    with col1:
-        if st.button("🔍 Check Availability", use_container_width=True, key="check_availability"):
-            if selected_restaurant_name != "No restaurants available":
-                selected_restaurant = next((r for r in restaurants if r['name'] == selected_restaurant_name), None)
-                
-                if selected_restaurant and st.session_state.ai_agent_ready and ai_agent:
-                    # Use AI agent to check availability
-                    availability_query = f"Check availability for {selected_restaurant_name} on {reservation_date} at {reservation_time} for {party_size} people"
-                    response = ai_agent.chat(availability_query)
-                    st.info(response)
-                else:
-                    # Fallback to API
-                    availability_data = {
-                        "restaurant_id": selected_restaurant['id'],
-                        "date": reservation_date.isoformat(),
-                        "time": reservation_time.strftime("%H:%M"),
-                        "party_size": party_size
-                    }
-                    result = make_api_request("availability", "POST", availability_data)
-                    if result and result.get('success'):
-                        if result.get('available'):
-                            st.success(f"✅ Available! {result.get('available_seats', 0)} seats remaining")
-                        else:
-                            st.warning(f"❌ Not available. Only {result.get('available_seats', 0)} seats remaining")
-    
-    with col2:
-        if st.button("🎯 Confirm Reservation", use_container_width=True, key="confirm_reservation"):
-            if user_name and user_email and restaurants and selected_restaurant_name != "No restaurants available":
-                selected_restaurant = next((r for r in restaurants if r['name'] == selected_restaurant_name), None)
-                
-                if selected_restaurant:
-                    reservation_data = {
-                        "restaurant_name": selected_restaurant['name'],
-                        "customer_name": user_name,
-                        "customer_email": user_email,
-                        "party_size": party_size,
-                        "reservation_date": reservation_date.isoformat(),
-                        "reservation_time": reservation_time.strftime("%H:%M"),
-                        "special_requests": special_requests
-                    }
-                    
-                    with st.spinner("🤖 AI is processing your reservation..."):
-                        if st.session_state.ai_agent_ready and ai_agent:
-                            # Use AI agent for reservation
-                            response = handle_reservation_with_ai(reservation_data)
-                            
-                            if "confirmed" in response.lower() or "success" in response.lower():
-                                st.markdown("""
-                                <div class="success-message">
-                                    🎉 <strong>Reservation Confirmed!</strong><br>
-                                    Your table has been successfully reserved. A confirmation email will be sent shortly.
-                                </div>
-                                """, unsafe_allow_html=True)
-                                st.balloons()
+        
+        # Check availability and reservation buttons
+        col1, col2, col3 = st.columns([1, 1, 1])
+        
+        with col1:
+            if st.form_submit_button("🔍 Check Availability", use_container_width=True, key="check_availability"):
+                if selected_restaurant_name != "No restaurants available":
+                    selected_restaurant = next((r for r in restaurants if r['name'] == selected_restaurant_name), None)
+        
+                    if selected_restaurant and st.session_state.ai_agent_ready and ai_agent:
+                        # Use AI agent to check availability
+                        availability_query = f"Check availability for {selected_restaurant_name} on {reservation_date} at {reservation_time} for {party_size} people"
+                        response = ai_agent.chat(availability_query)
+                        st.info(response)
+                    else:
+                        # Fallback to API
+                        availability_data = {
+                            "restaurant_id": selected_restaurant['id'],
+                            "date": reservation_date.isoformat(),
+                            "time": reservation_time.strftime("%H:%M"),
+                            "party_size": party_size
+                        }
+                        result = make_api_request("availability", "POST", availability_data)
+                        if result and result.get('success'):
+                            if result.get('available'):
+                                st.success(f"✅ Available! {result.get('available_seats', 0)} seats remaining")
                             else:
-                                st.markdown("""
-                                <div class="error-message">
-                                    ❌ <strong>Reservation Failed</strong><br>
-                                    We couldn't process your reservation. Please try again or contact us directly.
-                                </div>
-                                """, unsafe_allow_html=True)
-                        else:
-                            # Fallback to direct API
-                            api_reservation_data = {
-                                "restaurant_id": selected_restaurant['id'],
-                                "user_name": user_name,
-                                "user_email": user_email,
-                                "party_size": party_size,
-                                "date": reservation_date.isoformat(),
-                                "time": reservation_time.strftime("%H:%M"),
-                                "special_requests": special_requests
-                            }
-                            result = make_api_request("reservations", "POST", api_reservation_data)
-                            if result and result.get('success'):
-                                st.markdown("""
-                                <div class="success-message">
-                                    🎉 <strong>Reservation Confirmed!</strong><br>
-                                    Your table has been successfully reserved. A confirmation email will be sent shortly.
-                                </div>
-                                """, unsafe_allow_html=True)
-                                st.balloons()
+                                st.warning(f"❌ Not available. Only {result.get('available_seats', 0)} seats remaining")
+        
+        with col2:
+            if st.form_submit_button("🎯 Confirm Reservation", use_container_width=True, key="confirm_reservation"):
+                if user_name and user_email and restaurants and selected_restaurant_name != "No restaurants available":
+                    selected_restaurant = next((r for r in restaurants if r['name'] == selected_restaurant_name), None)
+        
+                    if selected_restaurant:
+                        reservation_data = {
+                            "restaurant_name": selected_restaurant['name'],
+                            "customer_name": user_name,
+                            "customer_email": user_email,
+                            "party_size": party_size,
+                            "reservation_date": reservation_date.isoformat(),
+                            "reservation_time": reservation_time.strftime("%H:%M"),
+                            "special_requests": special_requests
+                        }
+        
+                        with st.spinner("🤖 AI is processing your reservation..."):
+                            if st.session_state.ai_agent_ready and ai_agent:
+                                # Use AI agent for reservation
+                                response = handle_reservation_with_ai(reservation_data)
+        
+                                if "confirmed" in response.lower() or "success" in response.lower():
+                                    st.markdown("""
+                                    <div class="success-message">
+                                        🎉 <strong>Reservation Confirmed!</strong><br>
+                                        Your table has been successfully reserved. A confirmation email will be sent shortly.
+                                    </div>
+                                    """, unsafe_allow_html=True)
+                                    st.balloons()
+                                else:
+                                    st.markdown("""
+                                    <div class="error-message">
+                                        ❌ <strong>Reservation Failed</strong><br>
+                                        We couldn't process your reservation. Please try again or contact us directly.
+                                    </div>
+                                    """, unsafe_allow_html=True)
                             else:
-                                st.markdown("""
-                                <div class="error-message">
-                                    ❌ <strong>Reservation Failed</strong><br>
-                                    We couldn't process your reservation. Please try again or contact us directly.
-                                </div>
-                                """, unsafe_allow_html=True)
-            else:
-                st.markdown("""
-                <div class="error-message">
-                    ⚠️ <strong>Missing Information</strong><br>
-                    Please fill in all required fields to complete your reservation.
-                </div>
-                """, unsafe_allow_html=True)
-    
-    with col3:
-        if st.button("🤖 Ask AI for Help", use_container_width=True, key="ai_help"):
-            if st.session_state.ai_agent_ready and ai_agent:
-                help_response = ai_agent.chat("Help me make a reservation. What information do you need?")
-                st.info(help_response)
-            else:
-                st.info("AI assistant is not available. Please fill out the form manually.")
+                                # Fallback to direct API
+                                api_reservation_data = {
+                                    "restaurant_id": selected_restaurant['id'],
+                                    "user_name": user_name,
+                                    "user_email": user_email,
+                                    "party_size": party_size,
+                                    "date": reservation_date.isoformat(),
+                                    "time": reservation_time.strftime("%H:%M"),
+                                    "special_requests": special_requests
+                                }
+                                result = make_api_request("reservations", "POST", api_reservation_data)
+                                if result and result.get('success'):
+                                    st.markdown("""
+                                    <div class="success-message">
+                                        🎉 <strong>Reservation Confirmed!</strong><br>
+                                        Your table has been successfully reserved. A confirmation email will be sent shortly.
+                                    </div>
+                                    """, unsafe_allow_html=True)
+                                    st.balloons()
+                                else:
+                                    st.markdown("""
+                                    <div class="error-message">
+                                        ❌ <strong>Reservation Failed</strong><br>
+                                        We couldn't process your reservation. Please try again or contact us directly.
+                                    </div>
+                                    """, unsafe_allow_html=True)
+                else:
+                    st.markdown("""
+                    <div class="error-message">
+                        ⚠️ <strong>Missing Information</strong><br>
+                        Please fill in all required fields to complete your reservation.
+                    </div>
+                    """, unsafe_allow_html=True)
+        
+        with col3:
+            if st.form_submit_button("🤖 Ask AI for Help", use_container_width=True, key="ai_help"):
+                if st.session_state.ai_agent_ready and ai_agent:
+                    help_response = ai_agent.chat("Help me make a reservation. What information do you need?")
+                    st.info(help_response)
+                else:
+                    st.info("AI assistant is not available. Please fill out the form manually.")
+        
     
     st.markdown('</div>', unsafe_allow_html=True)
 
-elif st.session_state.current_page == "Discover":
+@st.fragment
+def discover_page():
+    """Restaurant search and discovery page"""
     st.markdown("### 🔍 Discover Exceptional Restaurants")
     
     col1, col2, col3, col4 = st.columns(4)
@@ -994,7 +690,7 @@ elif st.session_state.current_page == "Discover":
         city_filter = st.selectbox("📍 Location", ["All Cities", "New York", "Los Angeles", "Chicago", "San Francisco", "Miami"], key="city_filter")
     
     # Search and AI Recommendations
-    col1, col2 = st.columns(2)
+    col1, col2, col3 = st.columns([2, 2, 1])
     with col1:
         if st.button("🔍 Search Restaurants", use_container_width=True, key="search_restaurants"):
             params = []
@@ -1037,6 +733,14 @@ elif st.session_state.current_page == "Discover":
             else:
                 st.warning("AI recommendations not available. Using search instead.")
     
+    with col3:
+        # Cached catalog responses live up to five minutes; drop them on demand
+        if st.button("🔄 Refresh", use_container_width=True, key="refresh_data"):
+            _fetch_restaurants.clear()
+            _cached_api.clear()
+            _featured_restaurants.clear()
+            st.toast("Restaurant data refreshed")
+    
     # Display restaurants
     if st.session_state.restaurants:
         st.markdown("### 🍽️ Restaurant Results")
@@ -1058,11 +762,25 @@ elif st.session_state.current_page == "Discover":
             
             if st.button(f"Reserve at {restaurant['name']}", key=f"discover_book_{restaurant['id']}", use_container_width=True):
                 st.session_state.selected_restaurant = restaurant
-                st.session_state.current_page = "Booking"
-                st.rerun()
+                st.switch_page(PAGES["Booking"])
     
     st.markdown('</div>', unsafe_allow_html=True)
 
+# Navigation with proper state management; only the selected page runs
+PAGES = {
+    "Home": st.Page(home_page, title="Home", icon="🏠", url_path="home", default=True),
+    "Chat": st.Page(chat_page, title="AI Concierge", icon="🤖", url_path="chat"),
+    "Booking": st.Page(booking_page, title="Reserve Table", icon="📋", url_path="booking"),
+    "Discover": st.Page(discover_page, title="Discover", icon="🔍", url_path="discover"),
+}
+current_page = st.navigation(list(PAGES.values()), position="hidden")
+
+for col, page in zip(st.columns(4), PAGES.values()):
+    with col:
+        st.page_link(page, use_container_width=True)
+
+current_page.run()
+
 # Footer
 st.markdown("""
 <div style="text-align: center; margin-top: 3rem; padding: 2rem; color: rgba(139, 90, 60, 0.6);">
@@ -0,0 +1,9 @@
+-- Availability and reservation checks filter reservations by
+-- (restaurant_id, reservation_date, reservation_time) and sum party_size.
+-- Including party_size lets Postgres answer the sum with an index-only scan.
+--
+-- On a large live table run this statement on its own with
+-- CREATE INDEX CONCURRENTLY to avoid blocking writes.
+create index if not exists reservations_slot_idx
+    on reservations (restaurant_id, reservation_date, reservation_time)
+    include (party_size);
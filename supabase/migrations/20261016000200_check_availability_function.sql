@@ -0,0 +1,24 @@
+-- Restaurant name, capacity and seats already booked for one slot,
+-- returned in a single round-trip for /api/availability and /api/reservations.
+-- Returns no row when the restaurant does not exist.
+create or replace function check_availability(
+    rid restaurants.id%type,
+    rdate reservations.reservation_date%type,
+    rtime reservations.reservation_time%type
+)
+returns table (name text, capacity integer, reserved integer)
+language sql
+stable
+as $$
+    select r.name::text,
+           r.capacity::integer,
+           coalesce((
+               select sum(x.party_size)
+               from reservations x
+               where x.restaurant_id = r.id
+                 and x.reservation_date = rdate
+                 and x.reservation_time = rtime
+           ), 0)::integer
+    from restaurants r
+    where r.id = rid;
+$$;
@@ -0,0 +1,62 @@
+-- Check capacity and insert a reservation in one transaction.
+-- The restaurant row is locked so concurrent bookings for the same
+-- restaurant are serialized and a slot can never be oversold.
+--
+-- Returns a jsonb object whose status is one of:
+--   'created'   with restaurant_name and the inserted reservation
+--   'conflict'  with available_capacity
+--   'not_found' when the restaurant does not exist
+create or replace function create_reservation_if_available(
+    rid restaurants.id%type,
+    rdate reservations.reservation_date%type,
+    rtime reservations.reservation_time%type,
+    party reservations.party_size%type,
+    email reservations.user_email%type,
+    uname reservations.user_name%type
+)
+returns jsonb
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    slot_capacity integer;
+    restaurant_name text;
+    booked integer;
+    new_reservation reservations;
+begin
+    select r.capacity, r.name
+      into slot_capacity, restaurant_name
+      from restaurants r
+     where r.id = rid
+       for update;
+
+    if not found then
+        return jsonb_build_object('status', 'not_found');
+    end if;
+
+    select coalesce(sum(x.party_size), 0)
+      into booked
+      from reservations x
+     where x.restaurant_id = rid
+       and x.reservation_date = rdate
+       and x.reservation_time = rtime;
+
+    if slot_capacity - booked < party then
+        return jsonb_build_object(
+            'status', 'conflict',
+            'available_capacity', slot_capacity - booked
+        );
+    end if;
+
+    insert into reservations (restaurant_id, user_email, user_name, party_size, reservation_date, reservation_time)
+    values (rid, email, uname, party, rdate, rtime)
+    returning * into new_reservation;
+
+    return jsonb_build_object(
+        'status', 'created',
+        'restaurant_name', restaurant_name,
+        'reservation', to_jsonb(new_reservation)
+    );
+end;
+$$;
@@ -0,0 +1,8 @@
+-- The restaurant and recommendation endpoints filter with
+-- cuisine ILIKE '%x%', which a btree index cannot serve. A trigram GIN
+-- index lets Postgres answer substring matches without a sequential scan.
+-- The reservation slot lookup is covered by reservations_slot_idx.
+create extension if not exists pg_trgm;
+
+create index if not exists restaurants_cuisine_trgm_idx
+    on restaurants using gin (cuisine gin_trgm_ops);
@@ -0,0 +1,41 @@
+-- Reject any reservation insert that would overbook its slot, whichever
+-- client performs it (API, AI agent fallback, dashboard edits).
+-- The restaurant row is locked so concurrent inserts see each other's seats.
+create or replace function enforce_reservation_capacity()
+returns trigger
+language plpgsql
+as $$
+declare
+    slot_capacity integer;
+    booked integer;
+begin
+    select r.capacity
+      into slot_capacity
+      from restaurants r
+     where r.id = new.restaurant_id
+       for update;
+
+    if not found then
+        return new;  -- the foreign key reports unknown restaurants
+    end if;
+
+    select coalesce(sum(x.party_size), 0)
+      into booked
+      from reservations x
+     where x.restaurant_id = new.restaurant_id
+       and x.reservation_date = new.reservation_date
+       and x.reservation_time = new.reservation_time;
+
+    if booked + new.party_size > slot_capacity then
+        raise exception 'No available capacity. Only % seats available.', slot_capacity - booked
+            using errcode = 'check_violation';
+    end if;
+
+    return new;
+end;
+$$;
+
+drop trigger if exists enforce_capacity on reservations;
+create trigger enforce_capacity
+    before insert on reservations
+    for each row execute function enforce_reservation_capacity();
@@ -0,0 +1,30 @@
+-- Recommendation queries always rank by rating. Serving them from a
+-- materialized view pre-sorted and indexed on rating keeps the sort off
+-- the restaurants table; pg_cron refreshes it every five minutes.
+create materialized view if not exists top_restaurants as
+    select id, name, cuisine, city, rating, price_range, capacity
+      from restaurants
+     order by rating desc;
+
+-- refresh ... concurrently requires a unique index
+create unique index if not exists top_restaurants_id_idx
+    on top_restaurants (id);
+
+create index if not exists top_restaurants_rating_idx
+    on top_restaurants (rating desc);
+
+create index if not exists top_restaurants_filters_idx
+    on top_restaurants (cuisine, city, price_range);
+
+create index if not exists top_restaurants_cuisine_trgm_idx
+    on top_restaurants using gin (cuisine gin_trgm_ops);
+
+grant select on top_restaurants to anon, authenticated;
+
+create extension if not exists pg_cron;
+
+select cron.schedule(
+    'refresh-top-restaurants',
+    '*/5 * * * *',
+    $$refresh materialized view concurrently top_restaurants$$
+);
@@ -0,0 +1,16 @@
+-- City filters use ILIKE '%x%' like cuisine; give them trigram indexes too.
+create index if not exists restaurants_city_trgm_idx
+    on restaurants using gin (city gin_trgm_ops);
+
+create index if not exists top_restaurants_city_trgm_idx
+    on top_restaurants using gin (city gin_trgm_ops);
+
+-- Full-text search over name, cuisine and city for /api/restaurants?search=
+alter table restaurants
+    add column if not exists searchable tsvector
+    generated always as (
+        to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(cuisine, '') || ' ' || coalesce(city, ''))
+    ) stored;
+
+create index if not exists restaurants_searchable_idx
+    on restaurants using gin (searchable);
@@ -0,0 +1,15 @@
+-- Publish restaurants changes over Supabase Realtime so API workers can
+-- drop cached catalog responses as soon as a row changes
+-- (REALTIME_CACHE_INVALIDATION=true).
+do $$
+begin
+    if not exists (
+        select 1 from pg_publication_tables
+         where pubname = 'supabase_realtime'
+           and schemaname = 'public'
+           and tablename = 'restaurants'
+    ) then
+        alter publication supabase_realtime add table restaurants;
+    end if;
+end;
+$$;
@@ -0,0 +1,24 @@
+-- Capacity and seats already booked for one slot at many restaurants,
+-- for /api/availability/batch and smart recommendations.
+-- Restaurants that do not exist are simply absent from the result.
+create or replace function check_availability_batch(
+    rids uuid[],
+    rdate reservations.reservation_date%type,
+    rtime reservations.reservation_time%type
+)
+returns table (id uuid, name text, capacity integer, reserved integer)
+language sql
+stable
+as $$
+    select r.id,
+           r.name::text,
+           r.capacity::integer,
+           coalesce(sum(x.party_size), 0)::integer
+    from restaurants r
+    left join reservations x
+           on x.restaurant_id = r.id
+          and x.reservation_date = rdate
+          and x.reservation_time = rtime
+    where r.id = any(rids)
+    group by r.id;
+$$;
@@ -0,0 +1,54 @@
+-- Filter and score recommendation candidates in one query, returning only
+-- the top p_limit rows. Scoring mirrors the previous Python weights:
+--   rating 40%, cuisine match 25%, price match 20%, capacity 15%.
+-- A null preference skips its filter and scores neutrally.
+create or replace function recommend_restaurants(
+    p_cuisine text default null,
+    p_city text default null,
+    p_price_range text default null,
+    p_min_rating numeric default null,
+    p_limit integer default 10
+)
+returns table (
+    id restaurants.id%type,
+    name restaurants.name%type,
+    cuisine restaurants.cuisine%type,
+    city restaurants.city%type,
+    rating restaurants.rating%type,
+    price_range restaurants.price_range%type,
+    capacity restaurants.capacity%type,
+    recommendation_score numeric
+)
+language sql
+stable
+as $$
+    select t.id, t.name, t.cuisine, t.city, t.rating, t.price_range, t.capacity,
+           round((
+               t.rating / 5.0 * 40
+               + case
+                     when p_cuisine is null then 12.5
+                     when t.cuisine ilike '%' || p_cuisine || '%'
+                       or p_cuisine ilike '%' || t.cuisine || '%' then 25
+                     else 0
+                 end
+               + case
+                     when p_price_range is null then 10
+                     when t.price_range = p_price_range then 20
+                     when abs(length(t.price_range) - length(p_price_range)) <= 1 then 10
+                     else 0
+                 end
+               + case
+                     when t.capacity >= 100 then 15
+                     when t.capacity >= 50 then 12
+                     when t.capacity >= 20 then 8
+                     else 5
+                 end
+           )::numeric, 2) as recommendation_score
+    from top_restaurants t
+    where (p_cuisine is null or t.cuisine ilike '%' || p_cuisine || '%')
+      and (p_city is null or t.city ilike '%' || p_city || '%')
+      and (p_price_range is null or t.price_range = p_price_range)
+      and (p_min_rating is null or t.rating >= p_min_rating)
+    order by recommendation_score desc, t.rating desc
+    limit p_limit;
+$$;
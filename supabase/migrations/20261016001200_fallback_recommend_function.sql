@@ -0,0 +1,37 @@
+-- Recommendation fallback in one round-trip: top-rated restaurants at or
+-- above p_min_rating ('strict'), or, when none qualify, the top-rated
+-- restaurants overall ('broad').
+create or replace function fallback_recommend(
+    p_min_rating numeric,
+    p_limit integer default 10
+)
+returns table (
+    id restaurants.id%type,
+    name restaurants.name%type,
+    cuisine restaurants.cuisine%type,
+    city restaurants.city%type,
+    rating restaurants.rating%type,
+    price_range restaurants.price_range%type,
+    capacity restaurants.capacity%type,
+    source text
+)
+language plpgsql
+stable
+as $$
+begin
+    return query
+        select t.id, t.name, t.cuisine, t.city, t.rating, t.price_range, t.capacity, 'strict'::text
+          from top_restaurants t
+         where t.rating >= p_min_rating
+         order by t.rating desc
+         limit p_limit;
+
+    if not found then
+        return query
+            select t.id, t.name, t.cuisine, t.city, t.rating, t.price_range, t.capacity, 'broad'::text
+              from top_restaurants t
+             order by t.rating desc
+             limit p_limit;
+    end if;
+end;
+$$;
@@ -0,0 +1,36 @@
+-- recommend_restaurants plus whether each restaurant can still seat the
+-- party at the given slot, so smart recommendations need one round-trip.
+create or replace function recommend_with_availability(
+    p_date reservations.reservation_date%type,
+    p_time reservations.reservation_time%type,
+    p_party_size integer default 2,
+    p_cuisine text default null,
+    p_city text default null,
+    p_price_range text default null,
+    p_min_rating numeric default null,
+    p_limit integer default 10
+)
+returns table (
+    id restaurants.id%type,
+    name restaurants.name%type,
+    cuisine restaurants.cuisine%type,
+    city restaurants.city%type,
+    rating restaurants.rating%type,
+    price_range restaurants.price_range%type,
+    capacity restaurants.capacity%type,
+    recommendation_score numeric,
+    available boolean
+)
+language sql
+stable
+as $$
+    select r.*,
+           r.capacity - coalesce((
+               select sum(x.party_size)
+               from reservations x
+               where x.restaurant_id = r.id
+                 and x.reservation_date = p_date
+                 and x.reservation_time = p_time
+           ), 0) >= p_party_size
+    from recommend_restaurants(p_cuisine, p_city, p_price_range, p_min_rating, p_limit) r;
+$$;
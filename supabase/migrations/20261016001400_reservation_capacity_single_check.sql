@@ -0,0 +1,96 @@
+-- Make the enforce_capacity trigger the only capacity check on the booking path.
+--
+-- The trigger function runs as its owner so row level security cannot hide the
+-- restaurant row, and an unknown restaurant is now an error instead of an
+-- unchecked insert.
+create or replace function enforce_reservation_capacity()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    slot_capacity integer;
+    booked integer;
+begin
+    select r.capacity
+      into slot_capacity
+      from restaurants r
+     where r.id = new.restaurant_id
+       for update;
+
+    if not found then
+        raise exception 'Restaurant % not found', new.restaurant_id
+            using errcode = 'foreign_key_violation';
+    end if;
+
+    select coalesce(sum(x.party_size), 0)
+      into booked
+      from reservations x
+     where x.restaurant_id = new.restaurant_id
+       and x.reservation_date = new.reservation_date
+       and x.reservation_time = new.reservation_time;
+
+    if booked + new.party_size > slot_capacity then
+        raise exception 'No available capacity. Only % seats available.', slot_capacity - booked
+            using errcode = 'check_violation';
+    end if;
+
+    return new;
+end;
+$$;
+
+-- Insert a reservation and let enforce_capacity validate it.
+-- Overbooking raises check_violation from the trigger, which the API turns into 409.
+--
+-- Returns a jsonb object whose status is one of:
+--   'created'   with restaurant_name, the inserted reservation and available_capacity
+--   'not_found' when the restaurant does not exist
+create or replace function create_reservation_if_available(
+    rid restaurants.id%type,
+    rdate reservations.reservation_date%type,
+    rtime reservations.reservation_time%type,
+    party reservations.party_size%type,
+    email reservations.user_email%type,
+    uname reservations.user_name%type
+)
+returns jsonb
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    new_reservation reservations;
+    slot_capacity integer;
+    restaurant_name text;
+    booked integer;
+begin
+    begin
+        insert into reservations (restaurant_id, user_email, user_name, party_size, reservation_date, reservation_time)
+        values (rid, email, uname, party, rdate, rtime)
+        returning * into new_reservation;
+    exception when foreign_key_violation then
+        return jsonb_build_object('status', 'not_found');
+    end;
+
+    -- The trigger still holds the restaurant row lock, so this is the state it validated against
+    select r.capacity, r.name
+      into slot_capacity, restaurant_name
+      from restaurants r
+     where r.id = rid;
+
+    select coalesce(sum(x.party_size), 0)
+      into booked
+      from reservations x
+     where x.restaurant_id = rid
+       and x.reservation_date = rdate
+       and x.reservation_time = rtime;
+
+    return jsonb_build_object(
+        'status', 'created',
+        'restaurant_name', restaurant_name,
+        'reservation', to_jsonb(new_reservation),
+        'available_capacity', slot_capacity - booked
+    );
+end;
+$$;
@@ -0,0 +1,97 @@
+-- Serve recommendations straight from restaurants so rating and menu changes
+-- show up immediately instead of after the next top_restaurants refresh.
+-- The rating index and the cuisine/city trigram indexes (000500, 000800)
+-- cover the same filters and ordering the view was built for.
+create index if not exists restaurants_rating_idx
+    on restaurants (rating desc);
+
+create or replace function recommend_restaurants(
+    p_cuisine text default null,
+    p_city text default null,
+    p_price_range text default null,
+    p_min_rating numeric default null,
+    p_limit integer default 10
+)
+returns table (
+    id restaurants.id%type,
+    name restaurants.name%type,
+    cuisine restaurants.cuisine%type,
+    city restaurants.city%type,
+    rating restaurants.rating%type,
+    price_range restaurants.price_range%type,
+    capacity restaurants.capacity%type,
+    recommendation_score numeric
+)
+language sql
+stable
+as $$
+    select t.id, t.name, t.cuisine, t.city, t.rating, t.price_range, t.capacity,
+           round((
+               t.rating / 5.0 * 40
+               + case
+                     when p_cuisine is null then 12.5
+                     when t.cuisine ilike '%' || p_cuisine || '%'
+                       or p_cuisine ilike '%' || t.cuisine || '%' then 25
+                     else 0
+                 end
+               + case
+                     when p_price_range is null then 10
+                     when t.price_range = p_price_range then 20
+                     when abs(length(t.price_range) - length(p_price_range)) <= 1 then 10
+                     else 0
+                 end
+               + case
+                     when t.capacity >= 100 then 15
+                     when t.capacity >= 50 then 12
+                     when t.capacity >= 20 then 8
+                     else 5
+                 end
+           )::numeric, 2) as recommendation_score
+    from restaurants t
+    where (p_cuisine is null or t.cuisine ilike '%' || p_cuisine || '%')
+      and (p_city is null or t.city ilike '%' || p_city || '%')
+      and (p_price_range is null or t.price_range = p_price_range)
+      and (p_min_rating is null or t.rating >= p_min_rating)
+    order by recommendation_score desc, t.rating desc
+    limit p_limit;
+$$;
+
+create or replace function fallback_recommend(
+    p_min_rating numeric,
+    p_limit integer default 10
+)
+returns table (
+    id restaurants.id%type,
+    name restaurants.name%type,
+    cuisine restaurants.cuisine%type,
+    city restaurants.city%type,
+    rating restaurants.rating%type,
+    price_range restaurants.price_range%type,
+    capacity restaurants.capacity%type,
+    source text
+)
+language plpgsql
+stable
+as $$
+begin
+    return query
+        select t.id, t.name, t.cuisine, t.city, t.rating, t.price_range, t.capacity, 'strict'::text
+          from restaurants t
+         where t.rating >= p_min_rating
+         order by t.rating desc
+         limit p_limit;
+
+    if not found then
+        return query
+            select t.id, t.name, t.cuisine, t.city, t.rating, t.price_range, t.capacity, 'broad'::text
+              from restaurants t
+             order by t.rating desc
+             limit p_limit;
+    end if;
+end;
+$$;
+
+-- Nothing reads the view any more; stop refreshing it and drop it with its indexes.
+select cron.unschedule('refresh-top-restaurants');
+
+drop materialized view if exists top_restaurants;
@@ -0,0 +1,101 @@
+import os
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Callable
+import httpx
+from dotenv import load_dotenv
+from supabase import acreate_client, create_client, Client, ClientOptions
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+def create_pooled_client(url: str, key: str) -> Client:
+    """
+    Create a Supabase client whose PostgREST calls share a pooled keep-alive session.
+    
+    Args:
+        url: Supabase project URL
+        key: Supabase API key
+        
+    Returns:
+        Supabase client using an HTTP/2 connection pool for table and RPC calls
+    """
+    client = create_client(
+        url,
+        key,
+        options=ClientOptions(postgrest_client_timeout=10, storage_client_timeout=10)
+    )
+    
+    # Swap in a pooled HTTP/2 session so PostgREST calls reuse keep-alive connections
+    rest_session = client.postgrest.session
+    client.postgrest.session = httpx.Client(
+        base_url=rest_session.base_url,
+        headers={**rest_session.headers, 'Connection': 'keep-alive'},
+        timeout=rest_session.timeout,
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=50, max_connections=100)
+    )
+    rest_session.close()
+    return client
+
+@lru_cache(maxsize=None)
+def get_supabase() -> Client:
+    """Return the Supabase client shared by every module in this process."""
+    client = create_pooled_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_ANON_KEY"))
+    logger.info("Shared Supabase client initialized")
+    if os.getenv("WARM_START", "").lower() == "true":
+        warm_up(client)
+    return client
+
+def warm_up(client: Client) -> None:
+    """Open the pooled connection with a one-row query so the first real request skips DNS/TLS setup."""
+    try:
+        client.table("restaurants").select("id").limit(1).execute()
+        logger.info("Supabase connection warmed up")
+    except Exception as e:
+        logger.warning("Supabase warm-up failed: %s", e)
+
+async def watch_table(table: str, on_change: Callable[[], None], max_backoff: float = 60) -> None:
+    """
+    Call on_change whenever rows in a table are inserted, updated or deleted.
+    
+    Runs until cancelled. A failed or dropped Realtime connection is retried with
+    exponential backoff, and on_change is also called after every (re)subscribe
+    so changes missed while disconnected are not lost. Meant for the standalone
+    realtime_listener process, not for gunicorn's gevent workers.
+    
+    Args:
+        table: Table in the public schema (must be in the supabase_realtime publication)
+        on_change: Callback run on the event loop for every change
+        max_backoff: Longest wait in seconds between reconnect attempts
+    """
+    backoff = 1
+    while True:
+        client = None
+        try:
+            client = await acreate_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_ANON_KEY"))
+            channel = client.channel(f"{table}-changes")
+            channel.on_postgres_changes("*", callback=lambda payload: on_change(), table=table)
+            await channel.subscribe()
+            logger.info("Subscribed to realtime changes on %s", table)
+            backoff = 1
+            on_change()
+            while client.realtime.is_connected:
+                await asyncio.sleep(5)
+            logger.warning("Realtime connection for %s dropped", table)
+        except Exception as e:
+            logger.warning("Realtime subscription to %s failed: %s", table, e)
+        finally:
+            if client is not None:
+                try:
+                    await client.realtime.close()
+                except Exception:
+                    pass
+        await asyncio.sleep(backoff)
+        backoff = min(backoff * 2, max_backoff)
+
+# Export for use in other modules
+__all__ = ['get_supabase', 'create_pooled_client', 'warm_up', 'watch_table']
@@ -1,5 +1,9 @@
 # Add this to your ai_agent.py for testing
 import logging
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from cachetools import TTLCache
+from ai_agent import RestaurantAI
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -13,5 +17,54 @@ def test_api_connection(self):
     except Exception as e:
         logger.error(f"API connection test failed: {e}")
         return None
+
+def make_agent():
+    """RestaurantAI with a fake LLM client and tool handlers, skipping network setup"""
+    agent = RestaurantAI.__new__(RestaurantAI)
+    agent.client = MagicMock()
+    agent.system_prompt = RestaurantAI.SYSTEM_PROMPT
+    agent.context = [agent.system_prompt]
+    agent._llm_cache = TTLCache(maxsize=256, ttl=300)
+    agent.last_search_results = []
+    agent._tool_dispatch = {"search_restaurants": MagicMock(return_value="Found 1 restaurants (via api):\n• Trattoria")}
+    return agent
+
+def chunk(content=None, tool_calls=None):
+    """One streamed completion chunk with a single choice"""
+    delta = SimpleNamespace(content=content, tool_calls=tool_calls)
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+def tool_fragment(arguments, index=0, call_id=None, name=None):
+    return SimpleNamespace(index=index, id=call_id, function=SimpleNamespace(name=name, arguments=arguments))
+
+def test_stream_chat_reassembles_split_tool_call():
+    """Argument fragments of one tool call are joined, parsed and dispatched once"""
+    agent = make_agent()
+    agent.client.chat.completions.create.return_value = iter([
+        chunk(tool_calls=[tool_fragment('{"cuisine": ', call_id="call_1", name="search_restaurants")]),
+        chunk(tool_calls=[tool_fragment('"Italian", "city"')]),
+        chunk(tool_calls=[tool_fragment(': "Chicago"}')]),
+    ])
+    
+    answer = "".join(agent.stream_chat("Italian food in Chicago"))
+    
+    handler = agent._tool_dispatch["search_restaurants"]
+    handler.assert_called_once_with({"cuisine": "Italian", "city": "Chicago"})
+    # The tool result is self-explanatory, so no second LLM call is made
+    assert answer.startswith("Found 1 restaurants")
+    assert agent.client.chat.completions.create.call_count == 1
+    # Tool turns have side effects and are never cached
+    assert len(agent._llm_cache) == 0
+
+def test_stream_chat_caches_tool_free_answer():
+    """A plain answer is cached and replayed for the same conversation"""
+    agent = make_agent()
+    agent.client.chat.completions.create.return_value = iter([chunk("Hello"), chunk(" there!")])
+    
+    assert "".join(agent.stream_chat("hi there")) == "Hello there!"
+    assert list(agent._llm_cache.values()) == ["Hello there!"]
     
-test_api_connection()
\ No newline at end of file
+    # Same conversation again: answered from the cache without calling the model
+    agent.context = [agent.system_prompt]
+    assert "".join(agent.stream_chat("hi there")) == "Hello there!"
+    assert agent.client.chat.completions.create.call_count == 1
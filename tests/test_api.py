@@ -1,7 +1,14 @@
 import pytest
+import asyncio
 import json
 import logging
+import threading
+import time
 from datetime import date, timedelta
+from unittest.mock import AsyncMock, MagicMock
+from postgrest.exceptions import APIError
+import app as api
+import supabase_client
 from app import app
 
 # Configure test logging
@@ -94,5 +101,273 @@ def test_404_endpoint(client):
     response = client.get('/api/nonexistent')
     assert response.status_code == 404
 
+@pytest.fixture
+def slot_state():
+    """Empty slot cache and in-flight table around each slot lookup test"""
+    api._slot_cache.clear()
+    api._inflight_slots.clear()
+    yield
+    api._slot_cache.clear()
+    api._inflight_slots.clear()
+
+@pytest.fixture
+def fake_supabase(monkeypatch):
+    """Replace the module's Supabase client; tests configure rpc().execute()"""
+    fake = MagicMock()
+    monkeypatch.setattr(api, 'supabase', fake)
+    return fake
+
+def make_slot(restaurant_id="slot-test"):
+    return api.AvailabilityRequest(
+        restaurant_id=restaurant_id,
+        date=date.today() + timedelta(days=1),
+        time="19:00",
+        party_size=2
+    )
+
+def run_concurrently(target, count):
+    """Start count threads running target; outcomes collects (kind, value) as they finish"""
+    outcomes = []
+    def worker():
+        try:
+            outcomes.append(('ok', target()))
+        except Exception as e:
+            outcomes.append(('error', e))
+    threads = [threading.Thread(target=worker) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, outcomes
+
+def test_concurrent_slot_lookups_share_one_rpc(slot_state, fake_supabase):
+    """Identical lookups issued while one is running wait for it instead of querying"""
+    release = threading.Event()
+    row = {'name': 'Test Bistro', 'capacity': 40, 'reserved': 6}
+    def execute():
+        release.wait(5)
+        return MagicMock(data=[row])
+    fake_supabase.rpc.return_value.execute.side_effect = execute
+    
+    slot = make_slot()
+    threads, outcomes = run_concurrently(lambda: api.get_slot_capacity(slot), 8)
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    
+    assert fake_supabase.rpc.call_count == 1
+    assert outcomes == [('ok', row)] * 8
+    assert api.slot_key(slot) not in api._inflight_slots
+
+def test_slot_lookup_error_reaches_every_waiter(slot_state, fake_supabase):
+    """A failed query is raised to the leader and to every caller waiting on it"""
+    release = threading.Event()
+    def execute():
+        release.wait(5)
+        raise RuntimeError("database unavailable")
+    fake_supabase.rpc.return_value.execute.side_effect = execute
+    
+    slot = make_slot()
+    threads, outcomes = run_concurrently(lambda: api.get_slot_capacity(slot), 5)
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    
+    assert fake_supabase.rpc.call_count == 1
+    assert len(outcomes) == 5
+    assert all(kind == 'error' and isinstance(e, RuntimeError) for kind, e in outcomes)
+
+def test_slot_lookup_error_clears_inflight_entry(slot_state, fake_supabase):
+    """After a failure the slot is neither in flight nor cached, so the next call retries"""
+    fake_supabase.rpc.return_value.execute.side_effect = RuntimeError("database unavailable")
+    slot = make_slot()
+    
+    with pytest.raises(RuntimeError):
+        api.get_slot_capacity(slot)
+    
+    key = api.slot_key(slot)
+    assert key not in api._inflight_slots
+    assert key not in api._slot_cache
+    
+    fake_supabase.rpc.return_value.execute.side_effect = None
+    fake_supabase.rpc.return_value.execute.return_value = MagicMock(data=[])
+    assert api.get_slot_capacity(slot) is None
+    assert fake_supabase.rpc.call_count == 2
+
+def reservation_body(slot):
+    return json.dumps({
+        "restaurant_id": slot.restaurant_id,
+        "date": slot.date.isoformat(),
+        "time": slot.time,
+        "party_size": slot.party_size,
+        "user_email": "test@example.com",
+        "user_name": "Test User"
+    })
+
+def test_create_reservation_evicts_cached_slot(client, slot_state, fake_supabase):
+    """A successful booking drops this worker's cached capacity for the slot"""
+    slot = make_slot()
+    api._slot_cache[api.slot_key(slot)] = {'name': 'Test Bistro', 'capacity': 40, 'reserved': 6}
+    fake_supabase.rpc.return_value.execute.return_value = MagicMock(data={
+        'status': 'created',
+        'restaurant_name': 'Test Bistro',
+        'reservation': {'id': 1, 'restaurant_id': slot.restaurant_id},
+        'available_capacity': 32
+    })
+    
+    response = client.post('/api/reservations', data=reservation_body(slot),
+                           content_type='application/json')
+    
+    assert response.status_code == 201
+    assert api.slot_key(slot) not in api._slot_cache
+
+def test_rejected_reservation_evicts_cached_slot(client, slot_state, fake_supabase):
+    """A booking refused by the capacity trigger also drops the cached slot"""
+    slot = make_slot()
+    api._slot_cache[api.slot_key(slot)] = {'name': 'Test Bistro', 'capacity': 40, 'reserved': 6}
+    fake_supabase.rpc.return_value.execute.side_effect = APIError({
+        'message': 'No available capacity. Only 0 seats available.',
+        'code': '23514',
+        'hint': None,
+        'details': None
+    })
+    
+    response = client.post('/api/reservations', data=reservation_body(slot),
+                           content_type='application/json')
+    
+    assert response.status_code == 409
+    assert api.slot_key(slot) not in api._slot_cache
+
+def test_restaurants_change_bumps_generation(monkeypatch):
+    """A Realtime change on restaurants retires cached listings by bumping the generation key"""
+    callbacks = []
+    fake_client = MagicMock()
+    fake_client.channel.return_value.on_postgres_changes.side_effect = (
+        lambda event, callback, table: callbacks.append(callback))
+    fake_client.channel.return_value.subscribe = AsyncMock()
+    fake_client.realtime.is_connected = False
+    fake_client.realtime.close = AsyncMock()
+    monkeypatch.setattr(supabase_client, 'acreate_client', AsyncMock(return_value=fake_client))
+    
+    async def stop_listening(seconds):
+        raise asyncio.CancelledError
+    monkeypatch.setattr(supabase_client.asyncio, 'sleep', stop_listening)
+    
+    with app.app_context():
+        api.cache.delete(api.RESTAURANTS_GENERATION_KEY)
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(supabase_client.watch_table('restaurants', api.invalidate_restaurants_cache))
+        # Subscribing bumps once to cover changes missed while disconnected
+        assert api.cache.get(api.RESTAURANTS_GENERATION_KEY) == 1
+        
+        callbacks[0]({'eventType': 'UPDATE', 'table': 'restaurants'})
+        assert api.cache.get(api.RESTAURANTS_GENERATION_KEY) == 2
+
+@pytest.fixture
+def engine_supabase(monkeypatch):
+    """Replace the recommendation engine's Supabase client and empty the recommendation memo"""
+    fake = MagicMock()
+    monkeypatch.setattr(api.recommendation_engine, 'supabase', fake)
+    api._recommendation_cache.clear()
+    yield fake
+    api._recommendation_cache.clear()
+
+def recommended_row(restaurant_id, **extra):
+    return {'id': restaurant_id, 'name': f'Restaurant {restaurant_id}', 'cuisine': 'Italian',
+            'city': 'Mumbai', 'rating': 4.5, 'price_range': '$$', 'capacity': 60,
+            'recommendation_score': 85.0, **extra}
+
+def test_recommendations_map_preferences_to_rpc(client, engine_supabase):
+    """Preferences become recommend_restaurants parameters, with the limit passed through"""
+    rows = [recommended_row('r1'), recommended_row('r2')]
+    engine_supabase.rpc.return_value.execute.return_value = MagicMock(data=rows)
+    
+    response = client.post('/api/recommendations', data=json.dumps({
+        'cuisine': 'Italian', 'city': 'Mumbai', 'price_range': '$$', 'min_rating': '4.2'
+    }), content_type='application/json')
+    
+    assert response.status_code == 200
+    engine_supabase.rpc.assert_called_once_with('recommend_restaurants', {
+        'p_cuisine': 'Italian',
+        'p_city': 'Mumbai',
+        'p_price_range': '$$',
+        'p_min_rating': 4.2,
+        'p_limit': 10
+    })
+    data = json.loads(response.data)
+    assert data['recommendations'] == rows
+    assert data['meta']['fallback_used'] is False
+
+def test_smart_recommendations_report_available_count(client, engine_supabase):
+    """A valid slot goes to recommend_with_availability and available_count counts open tables"""
+    slot_date = (date.today() + timedelta(days=1)).isoformat()
+    rows = [recommended_row('r1', available=True), recommended_row('r2', available=False),
+            recommended_row('r3', available=True)]
+    engine_supabase.rpc.return_value.execute.return_value = MagicMock(data=rows)
+    
+    response = client.post('/api/recommendations/smart', data=json.dumps({
+        'cuisine': 'Italian', 'date': slot_date, 'time': '19:00', 'party_size': 4
+    }), content_type='application/json')
+    
+    assert response.status_code == 200
+    engine_supabase.rpc.assert_called_once_with('recommend_with_availability', {
+        'p_cuisine': 'Italian',
+        'p_city': None,
+        'p_price_range': None,
+        'p_min_rating': 4.0,
+        'p_limit': 10,
+        'p_date': slot_date,
+        'p_time': '19:00',
+        'p_party_size': 4
+    })
+    data = json.loads(response.data)
+    assert data['meta']['available_count'] == 2
+    assert data['meta']['fallback_used'] is False
+    assert [r['available'] for r in data['data']] == [True, False, True]
+
+def batch_body(restaurant_ids, slot_date=None):
+    return json.dumps({
+        "restaurant_ids": restaurant_ids,
+        "date": slot_date or (date.today() + timedelta(days=1)).isoformat(),
+        "time": "19:00",
+        "party_size": 4
+    })
+
+@pytest.mark.parametrize('restaurant_ids', [[], "r1", [f"r{i}" for i in range(101)], None])
+def test_batch_availability_rejects_invalid_ids(client, fake_supabase, restaurant_ids):
+    """restaurant_ids must be a list of 1-100 ids; anything else is a 400 without a query"""
+    response = client.post('/api/availability/batch', data=batch_body(restaurant_ids),
+                           content_type='application/json')
+    
+    assert response.status_code == 400
+    data = json.loads(response.data)
+    assert data['success'] is False
+    assert any(d['field'] == 'restaurant_ids' for d in data['details'])
+    fake_supabase.rpc.assert_not_called()
+
+def test_batch_availability_maps_params_and_drops_missing(client, fake_supabase):
+    """One check_availability_batch call; restaurants it does not return are left out"""
+    slot_date = (date.today() + timedelta(days=1)).isoformat()
+    fake_supabase.rpc.return_value.execute.return_value = MagicMock(data=[
+        {'id': 'r1', 'name': 'Open Bistro', 'capacity': 40, 'reserved': 10},
+        {'id': 'r3', 'name': 'Full Trattoria', 'capacity': 20, 'reserved': 18}
+    ])
+    
+    response = client.post('/api/availability/batch', data=batch_body(['r1', 'r2', 'r3'], slot_date),
+                           content_type='application/json')
+    
+    assert response.status_code == 200
+    fake_supabase.rpc.assert_called_once_with('check_availability_batch', {
+        'rids': ['r1', 'r2', 'r3'],
+        'rdate': slot_date,
+        'rtime': '19:00'
+    })
+    data = json.loads(response.data)
+    assert [r['restaurant_id'] for r in data['data']] == ['r1', 'r3']
+    assert [r['available'] for r in data['data']] == [True, False]
+    assert [r['available_seats'] for r in data['data']] == [30, 2]
+    assert data['available_count'] == 1
+    assert data['requested_party_size'] == 4
+
 if __name__ == '__main__':
     pytest.main([__file__])